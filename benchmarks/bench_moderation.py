@@ -0,0 +1,293 @@
+# benchmarks/bench_moderation.py
+#
+# Ukur berapa banyak mesej sesaat Moderation.on_message boleh proses.
+# Korpus sintetik (mesej bersih, lucah dan lucah yang disamarkan) dihantar
+# terus ke cog guna objek Message/Guild/Member palsu dan warning store stub,
+# jadi tiada Discord atau SQLite yang terlibat. Queue enforcement dikosongkan
+# setiap --drain-every mesej supaya kos delete/warning termasuk dalam
+# msg/s; tindakan yang tetap tercicir (queue penuh) dilaporkan berasingan.
+#
+# Jalankan dari folder alphabot:
+#   python benchmarks/bench_moderation.py
+#   python benchmarks/bench_moderation.py --messages 50000 --save bench_baseline.json
+#   python benchmarks/bench_moderation.py --compare bench_baseline.json
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# Cog baca data/profanity.json relatif kepada folder semasa
+os.chdir(PROJECT_ROOT)
+os.environ.setdefault("ADMIN_ROLE_ID", "1")
+
+import cogs.moderation as moderation
+
+FILLER = [
+    "hello", "guys", "jom", "main", "server", "malam", "ni", "ok", "gg", "lol", "nice",
+    "bro", "siapa", "nak", "join", "event", "esok", "thanks", "admin", "tolong",
+]
+LEET = {"a": "4", "e": "3", "i": "1", "o": "0", "s": "$", "t": "7"}
+
+
+# --- Objek Discord palsu -----------------------------------------------------
+
+class FakeGuild:
+    def __init__(self, guild_id):
+        self.id = guild_id
+
+
+class FakeChannel:
+    def __init__(self, channel_id):
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+
+    def __str__(self):
+        return f"channel-{self.id}"
+
+    async def send(self, *args, **kwargs):
+        return None
+
+    async def delete_messages(self, messages):
+        return None
+
+
+class FakeMember:
+    bot = False
+
+    def __init__(self, user_id):
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+
+    def __str__(self):
+        return f"user-{self.id}"
+
+    async def ban(self, reason=None):
+        return None
+
+
+class FakeMessage:
+    def __init__(self, content, author, guild, channel, raw_mentions=()):
+        self.content = content
+        self.author = author
+        self.guild = guild
+        self.channel = channel
+        self.raw_mentions = list(raw_mentions)
+        self.raw_role_mentions = []
+        self.mention_everyone = False
+
+    async def delete(self):
+        return None
+
+
+class FakeBot:
+    def __init__(self):
+        self.user = FakeMember(0)
+
+    async def process_commands(self, message):
+        return None
+
+
+class StubWarningStore:
+    async def load_all(self):
+        return {}
+
+    async def add_many(self, deltas):
+        return None
+
+    async def close(self):
+        return None
+
+
+# --- Korpus ------------------------------------------------------------------
+
+def obfuscate(word, rng):
+    trick = rng.randrange(4)
+    if trick == 0:
+        return "".join(LEET.get(ch, ch) for ch in word)
+    if trick == 1:
+        return " ".join(word)
+    if trick == 2:
+        i = rng.randrange(len(word))
+        return word[:i] + word[i] * rng.randint(3, 6) + word[i + 1:]
+    return "\u200b".join(word)
+
+
+def make_corpus(count, profanity, rng, profane_ratio, obfuscated_ratio, users=500, channels=20):
+    guild = FakeGuild(1)
+    members = [FakeMember(1000 + i) for i in range(users)]
+    chans = [FakeChannel(100 + i) for i in range(channels)]
+    single_words = [w for w in profanity if " " not in w]
+    corpus = []
+    kinds = {"clean": 0, "profane": 0, "obfuscated": 0}
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(2, 20))]
+        roll = rng.random()
+        if roll < profane_ratio:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(profanity))
+            kinds["profane"] += 1
+        elif roll < profane_ratio + obfuscated_ratio:
+            words.insert(rng.randrange(len(words) + 1), obfuscate(rng.choice(single_words), rng))
+            kinds["obfuscated"] += 1
+        else:
+            kinds["clean"] += 1
+        corpus.append(FakeMessage(" ".join(words), rng.choice(members), guild, rng.choice(chans)))
+    return corpus, kinds
+
+
+# --- Ukuran ------------------------------------------------------------------
+
+async def build_cog():
+    # Ganti WarningStore sebelum cog dibina, supaya helpers/user_warnings.db
+    # sebenar tak pernah dibuka (atau ditukar ke WAL) oleh benchmark
+    original_store = moderation.WarningStore
+    moderation.WarningStore = StubWarningStore
+    try:
+        cog = moderation.Moderation(FakeBot())
+    finally:
+        moderation.WarningStore = original_store
+    cog.warnings.flush_interval = 3600
+    await cog.warnings.start()
+    await cog.profanity.reload()
+    # Tiada tetingkap batch: worker terus proses bila diberi masa loop
+    cog.enforcement.window = 0
+
+    # Kira tindakan yang masuk queue dan yang tercicir kerana queue penuh
+    cog.enforcement_counts = {"queued": 0, "dropped": 0}
+    submit = cog.enforcement.submit
+
+    def counting_submit(guild_id, offense):
+        accepted = submit(guild_id, offense)
+        cog.enforcement_counts["queued" if accepted else "dropped"] += 1
+        return accepted
+    cog.enforcement.submit = counting_submit
+    return cog
+
+
+async def drain(cog):
+    # Beri masa loop kepada worker enforcement sehingga semua queue kosong
+    while any(not worker.done() for worker in cog.enforcement._workers.values()):
+        await asyncio.sleep(0)
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def measure_latency(cog, corpus, drain_every):
+    # Latency = on_message sahaja; msg/s termasuk masa worker enforcement
+    handler = cog.on_message
+    latencies = []
+    perf = time.perf_counter_ns
+    cog.enforcement_counts.update(queued=0, dropped=0)
+    start = perf()
+    for index, message in enumerate(corpus, start=1):
+        t0 = perf()
+        await handler(message)
+        latencies.append(perf() - t0)
+        if index % drain_every == 0:
+            await drain(cog)
+    await drain(cog)
+    total = (perf() - start) / 1e9
+    latencies.sort()
+    return {
+        "messages_per_sec": len(corpus) / total,
+        "p50_us": percentile(latencies, 50) / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+        "max_us": latencies[-1] / 1000,
+        "enforced": cog.enforcement_counts["queued"],
+        "dropped": cog.enforcement_counts["dropped"],
+    }
+
+
+async def measure_allocations(cog, corpus, drain_every):
+    # Bait yang diperuntukkan sementara (peak) dan blok yang kekal per mesej
+    handler = cog.on_message
+    tracemalloc.start()
+    transient = 0
+    blocks_before = sys.getallocatedblocks()
+    for index, message in enumerate(corpus, start=1):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await handler(message)
+        _, peak = tracemalloc.get_traced_memory()
+        transient += peak - current
+        if index % drain_every == 0:
+            await drain(cog)
+    await drain(cog)
+    blocks_after = sys.getallocatedblocks()
+    tracemalloc.stop()
+    return {
+        "alloc_bytes_per_msg": transient / len(corpus),
+        "retained_blocks_per_msg": (blocks_after - blocks_before) / len(corpus),
+    }
+
+
+def print_report(results, baseline=None):
+    labels = [
+        ("messages_per_sec", "messages/sec", True),
+        ("p50_us", "p50 latency (us)", False),
+        ("p99_us", "p99 latency (us)", False),
+        ("max_us", "max latency (us)", False),
+        ("alloc_bytes_per_msg", "alloc bytes/msg", False),
+        ("retained_blocks_per_msg", "retained blocks/msg", False),
+        ("enforced", "actions enforced", None),
+        ("dropped", "actions dropped", False),
+    ]
+    for key, label, higher_is_better in labels:
+        line = f"{label:>22}: {results[key]:>12.1f}"
+        if baseline and key in baseline and baseline[key] and higher_is_better is not None:
+            change = (results[key] - baseline[key]) / baseline[key] * 100
+            better = change > 0 if higher_is_better else change < 0
+            line += f"   ({change:+.1f}% vs baseline{', better' if better else ''})"
+        print(line)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Moderation.on_message throughput benchmark")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--profane", type=float, default=0.05, help="fraction of plainly profane messages")
+    parser.add_argument("--obfuscated", type=float, default=0.05, help="fraction of obfuscated profane messages")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--drain-every", type=int, default=100,
+                        help="let enforcement workers empty their queues after this many messages")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cog = await build_cog()
+    corpus, kinds = make_corpus(args.messages, sorted(cog.profanity.base_words), rng, args.profane, args.obfuscated)
+    print(f"Corpus: {len(corpus)} messages ({kinds['clean']} clean, {kinds['profane']} profane, {kinds['obfuscated']} obfuscated)")
+
+    # on_message print setiap kesalahan, senyapkan semasa ukur
+    with contextlib.redirect_stdout(io.StringIO()):
+        await measure_latency(cog, corpus[: min(1000, len(corpus))], args.drain_every)  # warm-up
+        results = await measure_latency(cog, corpus, args.drain_every)
+        results.update(await measure_allocations(cog, corpus, args.drain_every))
+        await cog.enforcement.close()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+        print(f"Saved results to {args.save}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,143 @@
+# benchmarks/bench_profanity.py
+#
+# Bandingkan regex alternation lama dengan ProfanityMatcher (Aho-Corasick).
+# Jalankan dari folder alphabot:
+#   python benchmarks/bench_profanity.py
+#   python benchmarks/bench_profanity.py --sizes 100 1000 --messages 2000
+#   python benchmarks/bench_profanity.py --normalize   # termasuk kos text_normalizer
+#   python benchmarks/bench_profanity.py --check       # semakan regresi normalizer sahaja
+
+import argparse
+import json
+import os
+import random
+import re
+import string
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from helpers.profanity_matcher import ProfanityMatcher
+from helpers.text_normalizer import normalize
+
+DEFAULT_SIZES = [100, 1000, 5000, 10000, 50000]
+PROFANITY_JSON = os.path.join(PROJECT_ROOT, "data", "profanity.json")
+
+# Perkataan biasa yang mesti kekal dengan huruf bergandanya
+EXTRA_TERMS = ["ass", "boob", "butt"]
+# Ayat biasa yang tak boleh ditandakan (huruf berganda dalam senarai kata
+# tak boleh dipendekkan: "nigger" -> "niger", "hell" -> "hel", "ass" -> "as")
+BENIGN = [
+    "I flew to Niger last year",
+    "Hel is the Norse goddess",
+    "as you wish",
+    "bob said hi",
+    "but why",
+    "the pusy cat",
+    "ashole is not a word",
+]
+# Cubaan mengelak yang mesti masih ditangkap
+EVASIONS = ["fuuuck", "sh1t", "f u c k", "b a b i", "heeeell no", "what the hell"]
+
+
+def make_terms(size, rng):
+    terms = set()
+    while len(terms) < size:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        # Lebih kurang 1 dalam 20 ialah frasa beberapa perkataan
+        if rng.random() < 0.05:
+            word += " " + "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 6)))
+        terms.add(word)
+    return sorted(terms)
+
+
+def make_messages(terms, count, rng, profane_ratio=0.1):
+    filler = ["hello", "guys", "jom", "main", "server", "malam", "ni", "ok", "gg", "lol", "nice", "bro"]
+    messages = []
+    for _ in range(count):
+        words = [rng.choice(filler) for _ in range(rng.randint(3, 25))]
+        if rng.random() < profane_ratio:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(terms))
+        messages.append(" ".join(words))
+    return messages
+
+
+def compile_regex(terms):
+    pattern = r"\b(" + "|".join(map(re.escape, terms)) + r")\b"
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def scan_all(matcher, messages):
+    hits = 0
+    for message in messages:
+        if matcher.search(message):
+            hits += 1
+    return hits
+
+
+def check_normalizer():
+    """Run the shipped word list over BENIGN and EVASIONS; returns the number of failures."""
+    with open(PROFANITY_JSON, "r", encoding="utf-8") as f:
+        terms = json.load(f) + EXTRA_TERMS
+    matcher = ProfanityMatcher(terms, normalizer=normalize)
+    failures = 0
+    for text in BENIGN:
+        match = matcher.search(text)
+        if match:
+            print(f"❌ false positive: {text!r} matched {match.group()!r}")
+            failures += 1
+    for text in EVASIONS:
+        if not matcher.search(text):
+            print(f"❌ missed: {text!r} (normalized {normalize(text).text!r})")
+            failures += 1
+    print(f"Normalizer check: {len(BENIGN) + len(EVASIONS) - failures}/{len(BENIGN) + len(EVASIONS)} passed")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profanity regex vs Aho-Corasick benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--normalize", action="store_true", help="run the matcher with text_normalizer.normalize")
+    parser.add_argument("--check", action="store_true", help="only run the normalizer regression check")
+    args = parser.parse_args()
+
+    if args.check:
+        sys.exit(1 if check_normalizer() else 0)
+
+    print(f"{'terms':>7} | {'regex build':>11} | {'ac build':>9} | {'regex us/msg':>12} | {'ac us/msg':>9} | {'speedup':>7}")
+    print("-" * 72)
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        terms = make_terms(size, rng)
+        messages = make_messages(terms, args.messages, rng)
+
+        regex, regex_build = timed(lambda: compile_regex(terms))
+        normalizer = normalize if args.normalize else None
+        matcher, ac_build = timed(lambda: ProfanityMatcher(terms, normalizer=normalizer))
+
+        regex_hits, regex_scan = timed(lambda: scan_all(regex, messages))
+        ac_hits, ac_scan = timed(lambda: scan_all(matcher, messages))
+        if regex_hits != ac_hits and not args.normalize:
+            print(f"⚠️ hit count differs at {size} terms: regex={regex_hits} ac={ac_hits}")
+
+        regex_per_msg = regex_scan / len(messages) * 1e6
+        ac_per_msg = ac_scan / len(messages) * 1e6
+        print(
+            f"{size:>7} | {regex_build:>10.3f}s | {ac_build:>8.3f}s | "
+            f"{regex_per_msg:>12.1f} | {ac_per_msg:>9.1f} | {regex_per_msg / ac_per_msg:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_queue.py
+#
+# Bandingkan queue lama (deque tuple + senarai penuh dengan +=) dengan
+# SongQueue (Track __slots__ + paparan satu muka surat) untuk queue besar.
+# Jalankan dari folder alphabot:
+#   python benchmarks/bench_queue.py
+#   python benchmarks/bench_queue.py --sizes 1000 10000 50000
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import deque
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from helpers.music_queue import Track, SongQueue, format_duration
+
+DEFAULT_SIZES = [100, 1000, 10000]
+PAGE_SIZE = 10
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def legacy_render(queue):
+    description = ""
+    for i, (_, title, _, _, _) in enumerate(queue, start=1):
+        description += f"{i}. {title}\n"
+    return description
+
+
+def paged_render(queue, page):
+    return "\n".join(
+        f"`{position}.` {track.title[:80]} `[{format_duration(track.duration)}]` • {track.requester}"
+        for position, track in queue.page(page, PAGE_SIZE)
+    )
+
+
+def bench(size, rng):
+    rows = [(None, f"Song number {i}", f"vid{i:08d}", rng.randint(60, 600), 1000 + i % 50) for i in range(size)]
+
+    legacy = deque((url, title, vid, duration, f"<@{user}>") for url, title, vid, duration, user in rows)
+    queue = SongQueue(max_size=size + 1, allow_duplicates=False)
+    for url, title, vid, duration, user in rows:
+        queue.add(Track(url, title, vid, duration, user))
+
+    last_page = queue.page_count(PAGE_SIZE)
+    results = {
+        "render (old, full)": timed(lambda: legacy_render(legacy), 20),
+        "render (page 1)": timed(lambda: paged_render(queue, 1), 200),
+        "render (last page)": timed(lambda: paged_render(queue, last_page), 200),
+        "dedup check (old, scan)": timed(lambda: any(entry[2] == "missing" for entry in legacy), 20),
+        "dedup check": timed(lambda: queue.check(Track(None, "x", "missing", 0, 1)), 2000),
+    }
+
+    def remove_and_restore():
+        track = queue.remove(size // 2)
+        queue.add_front(track)
+        queue.move(0, size // 2)
+    results["remove+move middle"] = timed(remove_and_restore, 200)
+    results["shuffle"] = timed(queue.shuffle, 5)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SongQueue benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.sizes:
+        print(f"Queue of {size} tracks")
+        for label, micros in bench(size, rng).items():
+            print(f"  {label:>24}: {micros:>12.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# benchmarks/check_logsearch.py
+#
+# Semakan regresi /logsearch: satu muka surat penuh (LOGSEARCH_PAGE_SIZE
+# entri, setiap summary sepanjang MAX_SUMMARY_LENGTH) mesti muat dalam had
+# 6000 aksara satu embed Discord, walaupun tajuk carian paling panjang.
+#
+# Jalankan dari folder alphabot:
+#   python benchmarks/check_logsearch.py
+
+import asyncio
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+os.environ.setdefault("ADMIN_ROLE_ID", "1")
+os.environ.setdefault("ACTION_LOG_CHANNEL_ID", "1")
+
+from cogs.action_log import LogSearchView, LOGSEARCH_PAGE_SIZE
+from helpers.action_journal import JournalEntry, EVENT_TYPES, MAX_SUMMARY_LENGTH
+from helpers.log_dispatcher import MAX_EMBED_CHARS_PER_MESSAGE
+
+
+def full_page():
+    # Jenis event dengan label paling panjang dan user id 19 digit
+    event_type = max(EVENT_TYPES, key=lambda key: len(EVENT_TYPES[key]))
+    now = time.time()
+    return [
+        JournalEntry(index, 1, 10 ** 18 + index, 1, event_type, now, "x" * MAX_SUMMARY_LENGTH)
+        for index in range(LOGSEARCH_PAGE_SIZE)
+    ]
+
+
+async def main():
+    title = "🔎 Action Log • last 365 day(s) • " + "u" * 37 + " • " + max(EVENT_TYPES.values(), key=len)
+    view = LogSearchView(None, {}, title)
+    view.page = 999
+    embed = view.build_embed(full_page())
+    ok = len(embed) <= MAX_EMBED_CHARS_PER_MESSAGE and len(embed.fields) == LOGSEARCH_PAGE_SIZE
+    print(f"Logsearch page: {len(embed.fields)} fields, {len(embed)}/{MAX_EMBED_CHARS_PER_MESSAGE} chars "
+          f"-> {'ok' if ok else 'FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main()) else 1)
@@ -1,72 +1,350 @@
 import discord
 from discord.ext import commands
+from discord import app_commands
 import os
+import io
+import time
+from collections import Counter
+from helpers.action_journal import ActionJournal, EVENT_TYPES
+from helpers.message_cache import MessageCache, CachedMessage
+from helpers.permissions import has_role
+from helpers.log_dispatcher import (
+    LogDispatcher, channel_send, clip, EMBED_DESCRIPTION_LIMIT, EMBED_FIELD_VALUE_LIMIT, MAX_EMBED_CHARS_PER_MESSAGE
+)
+from helpers.webhook_sink import WebhookSink
 
 ACTION_LOG_CHANNEL_ID = int(os.getenv("ACTION_LOG_CHANNEL_ID"))
+ADMIN_ROLE_ID = int(os.getenv("ADMIN_ROLE_ID"))
+# Berapa lama embed dikumpul sebelum dihantar (saat), dan had buffer per channel
+ACTION_LOG_FLUSH_SECONDS = float(os.getenv("ACTION_LOG_FLUSH_SECONDS", 2))
+ACTION_LOG_BUFFER_SIZE = int(os.getenv("ACTION_LOG_BUFFER_SIZE", 100))
+# Bilangan webhook per channel log; 0 = hantar guna bot seperti biasa
+ACTION_LOG_WEBHOOKS = int(os.getenv("ACTION_LOG_WEBHOOKS", 0))
+# Berapa hari rekod jurnal disimpan untuk /logsearch
+ACTION_JOURNAL_RETENTION_DAYS = int(os.getenv("ACTION_JOURNAL_RETENTION_DAYS", 90))
+LOGSEARCH_PAGE_SIZE = 10
+# Had memori cache kandungan mesej (MB), untuk log edit/delete mesej lama
+MESSAGE_CACHE_MB = float(os.getenv("MESSAGE_CACHE_MB", 16))
+# Kandungan mesej dalam embed edit (sebelum + selepas) mesti muat dalam had description
+EDIT_CONTENT_LIMIT = 1900
+DELETE_CONTENT_LIMIT = 3800
+# Nilai field /logsearch: 10 entri x 500 aksara kekal bawah had 6000 satu embed
+LOGSEARCH_FIELD_LIMIT = 500
+
+class RoleChange:
+    """Role additions/removals for one member, merged while still buffered."""
+
+    __slots__ = ("user_mention", "added", "removed", "timestamp")
+
+    def __init__(self, user_mention, added, removed):
+        self.user_mention = user_mention
+        self.added = list(added)
+        self.removed = list(removed)
+        self.timestamp = discord.utils.utcnow()
+
+    def merge(self, other):
+        # Role yang ditambah kemudian dibuang (atau sebaliknya) saling batal
+        for name in other.added:
+            if name in self.removed:
+                self.removed.remove(name)
+            elif name not in self.added:
+                self.added.append(name)
+        for name in other.removed:
+            if name in self.added:
+                self.added.remove(name)
+            elif name not in self.removed:
+                self.removed.append(name)
+
+    def to_embed(self):
+        if self.added and not self.removed:
+            title = "✅ Role Added" if len(self.added) == 1 else "✅ Roles Added"
+            color = discord.Color.green()
+        elif self.removed and not self.added:
+            title = "❎ Role Removed" if len(self.removed) == 1 else "❎ Roles Removed"
+            color = discord.Color.red()
+        else:
+            title = "🔁 Roles Updated"
+            color = discord.Color.blurple()
+
+        description = f"**User:** {self.user_mention}"
+        if len(self.added) + len(self.removed) == 1:
+            description += f"\n**Role:** {(self.added or self.removed)[0]}"
+        else:
+            if self.added:
+                description += f"\n**Added:** {', '.join(self.added)}"
+            if self.removed:
+                description += f"\n**Removed:** {', '.join(self.removed)}"
+            if not self.added and not self.removed:
+                description += "\n**No net change**"
+
+        embed = discord.Embed(
+            title=title,
+            description=clip(description, EMBED_DESCRIPTION_LIMIT),
+            color=color,
+            timestamp=self.timestamp
+        )
+        embed.set_footer(text="ALPHA™ Action Log")
+        return embed
+
+class LogSearchView(discord.ui.View):
+    def __init__(self, journal, query, title):
+        super().__init__(timeout=300)
+        self.journal = journal
+        self.query = query
+        self.title = title
+        # cursors[i] = cursor untuk muka surat i (None = muka surat pertama)
+        self.cursors = [None]
+        self.page = 0
+        self.next_cursor = None
+
+    async def load_page(self):
+        entries, self.next_cursor = await self.journal.search(
+            cursor=self.cursors[self.page], limit=LOGSEARCH_PAGE_SIZE, **self.query
+        )
+        self.back.disabled = self.page == 0
+        self.next.disabled = self.next_cursor is None
+        return self.build_embed(entries)
+
+    def build_embed(self, entries):
+        embed = discord.Embed(title=self.title, color=discord.Color.blurple())
+        embed.set_footer(text=f"Page {self.page + 1} • ALPHA™ Action Log")
+        if not entries:
+            embed.description = "🚫 No matching log entries."
+        for entry in entries:
+            name = f"{EVENT_TYPES.get(entry.event_type, entry.event_type)} • <t:{int(entry.created_at)}:f>"
+            value = entry.summary or "-"
+            if entry.user_id:
+                value = f"<@{entry.user_id}> • {value}"
+            # Satu muka surat mesti muat dalam had 6000 aksara Discord
+            value = clip(value, LOGSEARCH_FIELD_LIMIT)
+            if len(embed) + len(name) + len(value) > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            embed.add_field(name=name, value=value, inline=False)
+        return embed
+
+    @discord.ui.button(label="⏪ Back", style=discord.ButtonStyle.secondary)
+    async def back(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.page > 0:
+            self.page -= 1
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Next ⏩", style=discord.ButtonStyle.primary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.next_cursor is not None:
+            if self.page + 1 >= len(self.cursors):
+                self.cursors.append(self.next_cursor)
+            self.page += 1
+        embed = await self.load_page()
+        await interaction.response.edit_message(embed=embed, view=self)
 
 class ActionLog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.webhook_sink = WebhookSink(pool_size=ACTION_LOG_WEBHOOKS) if ACTION_LOG_WEBHOOKS > 0 else None
+        send = self.webhook_sink.send if self.webhook_sink else channel_send
+
+        # Embed dikumpul per channel dan dihantar sampai 10 satu mesej
+        self.dispatcher = LogDispatcher(send=send, flush_latency=ACTION_LOG_FLUSH_SECONDS, max_buffer=ACTION_LOG_BUFFER_SIZE)
+
+        # Salinan setempat semua event untuk /logsearch
+        self.journal = ActionJournal(retention_days=ACTION_JOURNAL_RETENTION_DAYS)
+
+        # Kandungan mesej untuk raw edit/delete, lebih jimat dari max_messages
+        self.message_cache = MessageCache(max_bytes=int(MESSAGE_CACHE_MB * 1024 * 1024))
+
+    async def cog_load(self):
+        await self.journal.start()
+        if self.webhook_sink:
+            await self.webhook_sink.start()
+
+    async def cog_unload(self):
+        await self.dispatcher.close()
+        await self.journal.close()
+        if self.webhook_sink:
+            await self.webhook_sink.close()
 
     def get_log_channel(self, guild):
         return guild.get_channel(ACTION_LOG_CHANNEL_ID)
 
+    def lookup_message(self, message_id, cached_message):
+        # Cache sendiri dulu, kemudian cache discord.py
+        record = self.message_cache.get(message_id)
+        if record is None and cached_message is not None:
+            record = self.message_cache.add(cached_message)
+        return record
+
     @commands.Cog.listener()
-    async def on_message_edit(self, before, after):
-        if before.author.bot:
+    async def on_message(self, message):
+        if message.guild is None:
             return
-        channel = self.get_log_channel(before.guild)
+        self.message_cache.add(message)
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        if payload.guild_id is None or "content" not in payload.data:
+            return
+        record = self.lookup_message(payload.message_id, payload.cached_message)
+        after_content = payload.data["content"]
+        if record is not None:
+            if record.author_bot or record.content == after_content:
+                # Bot, atau cuma embed/link preview yang berubah
+                return
+            author_id = record.author_id
+            before_content = record.content
+            self.message_cache.update_content(payload.message_id, after_content)
+        else:
+            author = payload.data.get("author") or {}
+            if author.get("bot"):
+                return
+            author_id = int(author["id"]) if "id" in author else None
+            before_content = "*[not cached]*"
+
+        self.journal.record(
+            payload.guild_id, "message_edit", author_id, payload.channel_id,
+            f"Before: {before_content} | After: {after_content}",
+        )
+        guild = self.bot.get_guild(payload.guild_id)
+        channel = self.get_log_channel(guild) if guild else None
         if channel is None:
             return
 
         embed = discord.Embed(
             title="📝 Message Edited",
             description=(
-                f"**Author:** {before.author.mention}\n"
-                f"**Channel:** {before.channel.mention}\n\n"
-                f"**Before:** {before.content}\n"
-                f"**After:** {after.content}"
+                f"**Author:** {f'<@{author_id}>' if author_id else 'Unknown'}\n"
+                f"**Channel:** <#{payload.channel_id}>\n\n"
+                f"**Before:** {clip(before_content, EDIT_CONTENT_LIMIT)}\n"
+                f"**After:** {clip(after_content, EDIT_CONTENT_LIMIT)}"
             ),
             color=discord.Color.orange(),
-            timestamp=after.created_at
+            timestamp=discord.utils.utcnow()
         )
         embed.set_footer(text="ALPHA™ Action Log")
-        await channel.send(embed=embed)
+        await self.dispatcher.submit(channel, embed)
 
     @commands.Cog.listener()
-    async def on_message_delete(self, message):
-        if message.author.bot:
+    async def on_raw_message_delete(self, payload):
+        if payload.guild_id is None:
             return
-        channel = self.get_log_channel(message.guild)
+        record = self.message_cache.pop(payload.message_id)
+        if record is None and payload.cached_message is not None:
+            record = CachedMessage.from_message(payload.cached_message)
+        if record is not None and record.author_bot:
+            return
+
+        if record is not None:
+            author = f"<@{record.author_id}>"
+            content = record.content if record.content else "[Embed/Attachment]"
+        else:
+            author = "Unknown"
+            content = "*[not cached]*"
+
+        self.journal.record(
+            payload.guild_id, "message_delete", record.author_id if record else None, payload.channel_id, content,
+        )
+        guild = self.bot.get_guild(payload.guild_id)
+        channel = self.get_log_channel(guild) if guild else None
         if channel is None:
             return
 
         embed = discord.Embed(
             title="🗑️ Message Deleted",
             description=(
-                f"**Author:** {message.author.mention}\n"
-                f"**Channel:** {message.channel.mention}\n"
-                f"**Content:** {message.content if message.content else '[Embed/Attachment]'}"
+                f"**Author:** {author}\n"
+                f"**Channel:** <#{payload.channel_id}>\n"
+                f"**Content:** {clip(content, DELETE_CONTENT_LIMIT)}"
             ),
             color=discord.Color.red(),
-            timestamp=message.created_at
+            timestamp=discord.utils.snowflake_time(payload.message_id)
         )
 
-        images = [att.url for att in message.attachments if att.content_type and att.content_type.startswith("image")]
+        images = record.image_urls if record else []
         if images:
-            embed.add_field(name="🖼️ Images Deleted", value="\n".join(images), inline=False)
+            # URL yang tak muat dalam had field dikira sahaja, bukan dipotong separuh
+            value = ""
+            for index, url in enumerate(images):
+                more = f"\n…and {len(images) - index} more"
+                line = url if not value else "\n" + url
+                if len(value) + len(line) + len(more) > EMBED_FIELD_VALUE_LIMIT:
+                    value += more if value else clip(url, EMBED_FIELD_VALUE_LIMIT)
+                    break
+                value += line
+            embed.add_field(name="🖼️ Images Deleted", value=value, inline=False)
 
         embed.set_footer(text="ALPHA™ Action Log")
-        await channel.send(embed=embed)
+        await self.dispatcher.submit(channel, embed)
 
     @commands.Cog.listener()
-    async def on_member_update(self, before, after):
-        channel = self.get_log_channel(before.guild)
+    async def on_raw_bulk_message_delete(self, payload):
+        # Satu transcript + satu embed untuk purge, bukan satu embed per mesej
+        if payload.guild_id is None:
+            return
+        discord_cached = {message.id: message for message in payload.cached_messages}
+        guild = self.bot.get_guild(payload.guild_id)
+
+        lines = []
+        authors = Counter()
+        cached_count = 0
+        for message_id in sorted(payload.message_ids):
+            record = self.message_cache.pop(message_id)
+            if record is None and message_id in discord_cached:
+                record = CachedMessage.from_message(discord_cached[message_id])
+            sent_at = discord.utils.snowflake_time(message_id).strftime("%Y-%m-%d %H:%M:%S")
+            if record is None:
+                lines.append(f"[{sent_at}] <unknown> (message {message_id}): [not cached]")
+                continue
+
+            cached_count += 1
+            member = guild.get_member(record.author_id) if guild else None
+            author = f"{member} ({record.author_id})" if member else str(record.author_id)
+            authors[f"<@{record.author_id}>"] += 1
+            line = f"[{sent_at}] {author}: {record.content or '[Embed/Attachment]'}"
+            if record.attachments:
+                line += "\n    Attachments: " + " ".join(url for url, _ in record.attachments)
+            lines.append(line)
+
+        count = len(payload.message_ids)
+        self.journal.record(
+            payload.guild_id, "bulk_delete", channel_id=payload.channel_id,
+            summary=f"{count} messages deleted in <#{payload.channel_id}> ({cached_count} cached)",
+        )
+        channel = self.get_log_channel(guild) if guild else None
         if channel is None:
             return
 
+        description = (
+            f"**Channel:** <#{payload.channel_id}>\n"
+            f"**Messages:** {count} ({cached_count} with content)"
+        )
+        if authors:
+            top_authors = ", ".join(f"{mention} ×{n}" for mention, n in authors.most_common(10))
+            description += f"\n**Authors:** {top_authors}"
+        embed = discord.Embed(
+            title="🧹 Bulk Delete",
+            description=description,
+            color=discord.Color.dark_red(),
+            timestamp=discord.utils.utcnow()
+        )
+        embed.set_footer(text="ALPHA™ Action Log")
+
+        transcript = io.BytesIO("\n".join(lines).encode("utf-8"))
+        filename = f"bulk-delete-{payload.channel_id}-{int(time.time())}.txt"
+        try:
+            await channel.send(embed=embed, file=discord.File(transcript, filename=filename))
+        except Exception as e:
+            print(f"Failed to send bulk delete log for guild {payload.guild_id}: {e}")
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        channel = self.get_log_channel(before.guild)
+
         # Nickname change
         if before.nick != after.nick:
+            self.journal.record(
+                before.guild.id, "nickname", before.id,
+                summary=f"{before.nick or before.name} → {after.nick or after.name}",
+            )
             embed = discord.Embed(
                 title="✏️ Nickname Changed",
                 description=(
@@ -78,34 +356,32 @@ class ActionLog(commands.Cog):
                 timestamp=discord.utils.utcnow()
             )
             embed.set_footer(text="ALPHA™ Action Log")
-            await channel.send(embed=embed)
+            if channel is not None:
+                await self.dispatcher.submit(channel, embed)
 
         # Role changes
         removed_roles = set(before.roles) - set(after.roles)
         added_roles = set(after.roles) - set(before.roles)
 
-        for role in added_roles:
-            embed = discord.Embed(
-                title="✅ Role Added",
-                description=f"**User:** {before.mention}\n**Role:** {role.name}",
-                color=discord.Color.green(),
-                timestamp=discord.utils.utcnow()
-            )
-            embed.set_footer(text="ALPHA™ Action Log")
-            await channel.send(embed=embed)
-
-        for role in removed_roles:
-            embed = discord.Embed(
-                title="❎ Role Removed",
-                description=f"**User:** {before.mention}\n**Role:** {role.name}",
-                color=discord.Color.red(),
-                timestamp=discord.utils.utcnow()
+        if added_roles or removed_roles:
+            # Satu entri per member; perubahan seterusnya dalam buffer digabungkan
+            change = RoleChange(
+                before.mention,
+                [role.name for role in sorted(added_roles, key=lambda role: role.position, reverse=True)],
+                [role.name for role in sorted(removed_roles, key=lambda role: role.position, reverse=True)],
             )
-            embed.set_footer(text="ALPHA™ Action Log")
-            await channel.send(embed=embed)
+            summary = []
+            if change.added:
+                summary.append(f"Added: {', '.join(change.added)}")
+            if change.removed:
+                summary.append(f"Removed: {', '.join(change.removed)}")
+            self.journal.record(before.guild.id, "role_change", before.id, summary=" | ".join(summary))
+            if channel is not None:
+                await self.dispatcher.submit(channel, change, key=("roles", before.id))
 
     @commands.Cog.listener()
     async def on_member_ban(self, guild, user):
+        self.journal.record(guild.id, "ban", user.id, summary=f"{user} was banned.")
         channel = guild.get_channel(ACTION_LOG_CHANNEL_ID)
         if channel is None:
             return
@@ -117,10 +393,11 @@ class ActionLog(commands.Cog):
             timestamp=discord.utils.utcnow()
         )
         embed.set_footer(text="ALPHA™ Action Log")
-        await channel.send(embed=embed)
+        await self.dispatcher.submit(channel, embed)
 
     @commands.Cog.listener()
     async def on_member_unban(self, guild, user):
+        self.journal.record(guild.id, "unban", user.id, summary=f"{user} was unbanned.")
         channel = guild.get_channel(ACTION_LOG_CHANNEL_ID)
         if channel is None:
             return
@@ -132,7 +409,32 @@ class ActionLog(commands.Cog):
             timestamp=discord.utils.utcnow()
         )
         embed.set_footer(text="ALPHA™ Action Log")
-        await channel.send(embed=embed)
+        await self.dispatcher.submit(channel, embed)
+
+    @app_commands.command(name="logsearch", description="Search the action log history.")
+    @app_commands.describe(user="Only show events for this user", event="Only show this kind of event", days="How many days back to search")
+    @app_commands.choices(event=[app_commands.Choice(name=label, value=key) for key, label in EVENT_TYPES.items()])
+    async def logsearch(self, interaction: discord.Interaction, user: discord.User = None,
+                        event: app_commands.Choice[str] = None, days: app_commands.Range[int, 1, 365] = 30):
+        if not has_role(interaction.user, ADMIN_ROLE_ID):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        query = {
+            "guild_id": interaction.guild_id,
+            "user_id": user.id if user else None,
+            "event_type": event.value if event else None,
+            "since": time.time() - days * 86400,
+        }
+        title = f"🔎 Action Log • last {days} day(s)"
+        if user:
+            title += f" • {user}"
+        if event:
+            title += f" • {event.name}"
+
+        view = LogSearchView(self.journal, query, title)
+        embed = await view.load_page()
+        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
 
 async def setup(bot):
@@ -20,47 +20,12 @@ class Events(commands.Cog):
         await self.bot.change_presence(activity=activity)
         await self.bot.tree.sync(guild=discord.Object(id=GUILD_ID))
 
-        # Restore reaction controls and reconnect music playback
-        from cogs.music import Music
+        # Butang kawalan muzik (persistent) dan sambung semula playback
+        # (sesi dalam memori selepas reconnect, atau dari disk selepas restart)
+        self.bot.add_view(MusicControlView())
         music_cog = self.bot.get_cog("Music")
         if music_cog:
-            for guild_id, current_song_data in music_cog.CURRENT_SONG.items():
-                # Check current_song_data length for expected data including voice_channel_id
-                if current_song_data and len(current_song_data) >= 9:
-                    (
-                        audio_url,
-                        title,
-                        video_id,
-                        duration,
-                        requester,
-                        start_time,
-                        message_id,
-                        channel_id,
-                        voice_channel_id,
-                    ) = current_song_data
-
-                    voice_channel = self.bot.get_channel(voice_channel_id)
-                    text_channel = self.bot.get_channel(channel_id)
-
-                    if voice_channel and text_channel:
-                        voice_client = voice_channel.guild.voice_client
-
-                        # Connect if not connected
-                        if voice_client is None:
-                            voice_client = await voice_channel.connect()
-                        # Move if in different channel
-                        elif voice_client.channel.id != voice_channel_id:
-                            await voice_client.move_to(voice_channel)
-
-                        try:
-                            msg = await text_channel.fetch_message(message_id)
-                            for emoji in ["⏸️", "▶️", "⏭️", "⏹️"]:
-                                await msg.add_reaction(emoji)
-                        except Exception as e:
-                            print(f"Failed to restore reactions for guild {guild_id}: {e}")
-
-                        # Resume playing the song
-                        await music_cog.play_next_song(voice_client, guild_id, text_channel)
+            await music_cog.resume_sessions()
 
     @commands.Cog.listener()
     async def on_member_join(self, member):
@@ -107,3 +72,4 @@ async def setup(bot):
 
 # Import WhitelistView from admin cog for persistent button view
 from cogs.admin import WhitelistView
+from cogs.music import MusicControlView
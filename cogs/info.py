@@ -47,6 +47,9 @@ class InfoCog(commands.Cog):
                 "`/skip` - Skip song\n"
                 "`/stop` - Stop and disconnect\n"
                 "`/queue` - Song queue\n"
+                "`/remove` - Remove a queued song\n"
+                "`/move` - Move a queued song\n"
+                "`/shuffle` - Shuffle the queue\n"
                 "`/nowplaying` - Current song info"
             ),
             inline=False
@@ -64,7 +67,13 @@ class InfoCog(commands.Cog):
             value=(
                 "`/postwhitelist` - Post Whitelist embed\n"
                 "`/uptime` - Show bot uptime\n"
-                "`/embedbuilder` - Build interactive embed"
+                "`/embedbuilder` - Build interactive embed\n"
+                "`/profanityreload` - Reload profanity list\n"
+                "`/profanityadd` - Filter a word in this server\n"
+                "`/profanityremove` - Allow a word in this server\n"
+                "`/logsearch` - Search action log history\n"
+                "`/audiocache` - Music audio cache stats\n"
+                "`/streamstats` - Music stream CPU usage"
             ),
             inline=False
         )
@@ -83,7 +92,7 @@ class InfoCog(commands.Cog):
         )
         embed3.add_field(
             name="🛡️ Auto Mode",
-            value="Automatic warning for using profanity. Ban after 3 warnings.",
+            value="Automatic warning for profanity, spam, mention spam and link floods. Ban after 3 warnings.",
             inline=False
         )
         embeds.append(embed3)
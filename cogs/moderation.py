@@ -1,33 +1,136 @@
 import sys
 import os
-import json
-import re
 import discord
-from discord.ext import commands
-from helpers.db_helpers import increase_and_get_warnings, create_user_table
+from discord.ext import commands, tasks
+from discord import app_commands
+from helpers.db_helpers import WarningStore, WarningCache
+from helpers.enforcement import EnforcementQueue, Offense
+from helpers.spam_detector import SpamDetector, count_links
+from helpers.profanity_list import ProfanityFilter
+from helpers.permissions import has_role
 
 # Tambah folder parent ke path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+ADMIN_ROLE_ID = int(os.getenv("ADMIN_ROLE_ID"))
+
 # Path ke fail JSON
 PROFANITY_PATH = os.path.join("data", "profanity.json")
+# Tambahan/buangan perkataan per guild (dari /profanityadd & /profanityremove)
+PROFANITY_OVERRIDES_PATH = os.path.join("data", "profanity_overrides.json")
+
+MAX_WARNINGS = 3
+# Tindakan dikumpul selama ENFORCEMENT_WINDOW saat sebelum dilaksanakan
+ENFORCEMENT_WINDOW = 1.0
+ENFORCEMENT_QUEUE_SIZE = 500
 
-# Load perkataan lucah dari fail JSON
-if os.path.exists(PROFANITY_PATH):
-    with open(PROFANITY_PATH, "r", encoding="utf-8") as f:
-        PROFANITY = json.load(f)
-else:
-    print("⚠️ 'profanity.json' not found. Using default words.")
-    PROFANITY = ["default", "bad", "words"]
+# Had spam/flood, boleh diubah dalam .env
+SPAM_MAX_MESSAGES = int(os.getenv("SPAM_MAX_MESSAGES", 6))
+SPAM_MESSAGE_WINDOW = float(os.getenv("SPAM_MESSAGE_WINDOW", 5))
+SPAM_MAX_MENTIONS = int(os.getenv("SPAM_MAX_MENTIONS", 8))
+SPAM_MENTION_WINDOW = float(os.getenv("SPAM_MENTION_WINDOW", 10))
+SPAM_MAX_LINKS = int(os.getenv("SPAM_MAX_LINKS", 4))
+SPAM_LINK_WINDOW = float(os.getenv("SPAM_LINK_WINDOW", 10))
+SPAM_MAX_REPEATS = int(os.getenv("SPAM_MAX_REPEATS", 4))
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        create_user_table()
+        # Kiraan warning dalam memori, ditulis ke SQLite secara berkelompok
+        self.warnings = WarningCache(WarningStore())
+
+        # Automaton per guild, dibina di thread lain bila senarai berubah.
+        # Mesej dinormalisasi dulu untuk tangkap leetspeak, "b a b i", dll.
+        self.profanity = ProfanityFilter(PROFANITY_PATH, PROFANITY_OVERRIDES_PATH)
+
+        self.spam = SpamDetector(
+            max_messages=SPAM_MAX_MESSAGES,
+            message_window=SPAM_MESSAGE_WINDOW,
+            max_mentions=SPAM_MAX_MENTIONS,
+            mention_window=SPAM_MENTION_WINDOW,
+            max_links=SPAM_MAX_LINKS,
+            link_window=SPAM_LINK_WINDOW,
+            max_repeats=SPAM_MAX_REPEATS,
+        )
+
+        # Delete/warning/ban dibuat oleh worker per guild, bukan dalam on_message
+        self.enforcement = EnforcementQueue(self.enforce_batch, maxsize=ENFORCEMENT_QUEUE_SIZE, window=ENFORCEMENT_WINDOW)
+
+    async def cog_load(self):
+        await self.warnings.start()
+        await self.profanity.reload()
+        self.watch_profanity_file.start()
+
+    async def cog_unload(self):
+        self.watch_profanity_file.cancel()
+        await self.enforcement.close()
+        # Flush semua kiraan yang belum ditulis sebelum tutup
+        await self.warnings.close()
+
+    @tasks.loop(seconds=30)
+    async def watch_profanity_file(self):
+        # Reload bila profanity.json diubah, tak perlu restart bot
+        if self.profanity.file_changed():
+            try:
+                count = await self.profanity.reload()
+                print(f"Profanity list reloaded ({count} words).")
+            except Exception as e:
+                print(f"Failed to reload profanity list: {e}")
+
+    def has_admin_role(self, interaction: discord.Interaction):
+        return has_role(interaction.user, ADMIN_ROLE_ID)
 
-        # Compile regex sekali sahaja
-        pattern = r"\b(" + "|".join(map(re.escape, PROFANITY)) + r")\b"
-        self.profanity_regex = re.compile(pattern, re.IGNORECASE)
+    def can_mass_mention(self, member):
+        # Mesej webhook tiada Member, jadi tiada guild_permissions
+        permissions = getattr(member, "guild_permissions", None)
+        return permissions is not None and (permissions.mention_everyone or permissions.manage_messages)
+
+    @app_commands.command(name="profanityreload", description="Reload the profanity word list from file.")
+    async def profanityreload(self, interaction: discord.Interaction):
+        if not self.has_admin_role(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            count = await self.profanity.reload()
+        except Exception as e:
+            await interaction.followup.send(f"⚠️ Failed to reload profanity list: {e}", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title="Profanity List Reloaded",
+            description=f"🔄 Loaded **{count}** words. This server filters **{len(self.profanity.words_for(interaction.guild_id))}** words.",
+            color=discord.Color.green()
+        )
+        embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="profanityadd", description="Add a word to this server's profanity filter.")
+    @app_commands.describe(word="Word or phrase to filter")
+    async def profanityadd(self, interaction: discord.Interaction, word: str):
+        if not self.has_admin_role(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        if await self.profanity.add_word(interaction.guild_id, word):
+            await interaction.followup.send(f"✅ `{word}` is now filtered in this server.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"❌ `{word}` is already filtered.", ephemeral=True)
+
+    @app_commands.command(name="profanityremove", description="Stop filtering a word in this server.")
+    @app_commands.describe(word="Word or phrase to allow")
+    async def profanityremove(self, interaction: discord.Interaction, word: str):
+        if not self.has_admin_role(interaction):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        if await self.profanity.remove_word(interaction.guild_id, word):
+            await interaction.followup.send(f"✅ `{word}` is no longer filtered in this server.", ephemeral=True)
+        else:
+            await interaction.followup.send(f"❌ `{word}` is not in the filter.", ephemeral=True)
 
     @commands.Cog.listener()
     async def on_message(self, message):
@@ -41,37 +144,96 @@ class Moderation(commands.Cog):
         user_id = message.author.id
 
         # Check untuk perkataan lucah
-        if self.profanity_regex.search(message.content):
-            warnings = increase_and_get_warnings(user_id, guild_id)
+        match = self.profanity.search(guild_id, message.content)
+        if match:
+            # Log teks asal yang ditaip, bukan versi yang dinormalisasi
+            print(f"Profanity from {message.author} in #{message.channel}: {match.group()!r}")
+            self.punish(message, "profanity")
+            return
+
+        # Check untuk spam/flood (mesej laju, mention, link, mesej berulang)
+        # @everyone/@here dikira satu mention sahaja; staff yang memang boleh
+        # ping semua orang tak disemak untuk mention spam langsung
+        mention_count = len(message.raw_mentions) + len(message.raw_role_mentions) + (1 if message.mention_everyone else 0)
+        if mention_count and self.can_mass_mention(message.author):
+            mention_count = 0
+        reason = self.spam.check(
+            guild_id,
+            message.channel.id,
+            user_id,
+            message.content,
+            mention_count=mention_count,
+            link_count=count_links(message.content),
+        )
+        if reason:
+            print(f"Spam ({reason}) from {message.author} in #{message.channel}")
+            self.punish(message, reason)
+            return
+
+        await self.bot.process_commands(message)
+
+    def punish(self, message, reason):
+        # Semua jenis kesalahan guna kiraan warning yang sama
+        warnings = self.warnings.increment(message.author.id, message.guild.id)
+        if not self.enforcement.submit(message.guild.id, Offense(message, warnings, reason)):
+            print(f"⚠️ Enforcement queue full for guild {message.guild.id}, dropping action for {message.author}")
+
+    async def enforce_batch(self, guild_id, offenses):
+        # Satu warning/ban per user untuk setiap batch, bukan satu per mesej
+        by_user = {}
+        for offense in offenses:
+            by_user.setdefault(offense.message.author.id, []).append(offense)
 
-            if warnings >= 3:
+        await self.delete_messages([offense.message for offense in offenses])
+
+        for user_offenses in by_user.values():
+            latest = max(user_offenses, key=lambda offense: offense.warnings)
+            author = latest.message.author
+            channel = latest.message.channel
+
+            if latest.warnings >= MAX_WARNINGS:
                 try:
-                    await message.author.ban(reason="Exceeded 3 warnings for profanity.")
+                    await author.ban(reason=f"Exceeded {MAX_WARNINGS} warnings for {latest.reason}.")
                     embed = discord.Embed(
                         title="User Banned",
-                        description=f"🚫 {message.author.mention} has been banned for repeated use of profanity.",
+                        description=f"🚫 {author.mention} has been banned for repeated use of {latest.reason}.",
                         color=discord.Color.red()
                     )
                     embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
-                    await message.channel.send(embed=embed)
+                    await channel.send(embed=embed)
                 except Exception as e:
-                    await message.channel.send(f"⚠️ Failed to ban user: {e}")
+                    await channel.send(f"⚠️ Failed to ban user: {e}")
             else:
+                description = f"⚠️ Warning {latest.warnings}/{MAX_WARNINGS} to {author.mention}. If you reach {MAX_WARNINGS} warnings, you will be banned."
+                if len(user_offenses) > 1:
+                    description += f"\n\n🗑️ {len(user_offenses)} messages removed."
                 embed = discord.Embed(
                     title="Amaran",
-                    description=f"⚠️ Warning {warnings}/3 to {message.author.mention}. If you reach 3 warnings, you will be banned.",
+                    description=description,
                     color=discord.Color.orange()
                 )
                 embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
-                await message.channel.send(embed=embed)
+                try:
+                    await channel.send(embed=embed)
+                except Exception as e:
+                    print(f"Failed to send warning in guild {guild_id}: {e}")
 
-            try:
-                await message.delete()
-            except:
-                pass
-            return
+    async def delete_messages(self, messages):
+        # Kumpul ikut channel, guna bulk delete bila lebih dari satu mesej
+        by_channel = {}
+        for message in messages:
+            by_channel.setdefault(message.channel.id, (message.channel, []))[1].append(message)
 
-        await self.bot.process_commands(message)
+        for channel, channel_messages in by_channel.values():
+            for i in range(0, len(channel_messages), 100):
+                chunk = channel_messages[i:i + 100]
+                try:
+                    if len(chunk) == 1:
+                        await chunk[0].delete()
+                    else:
+                        await channel.delete_messages(chunk)
+                except Exception as e:
+                    print(f"Failed to delete {len(chunk)} messages in #{channel}: {e}")
 
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
@@ -1,21 +1,211 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from collections import deque
 import asyncio
 import datetime
-import yt_dlp
 from yt_dlp.utils import DownloadError, ExtractorError
 import os
+import re
+import time
+from helpers.track_cache import TrackCache
+from helpers.extractor import Extractor
+from helpers.audio_cache import AudioCache
+from helpers.stream_stats import StreamStats
+from helpers.music_queue import Track, NowPlaying, SongQueue, format_duration
+from helpers.panel_updater import PanelUpdater
+from helpers.player import GuildPlayer
+from helpers.music_sessions import SessionStore
+from helpers.permissions import has_role
 
 WHITELIST_ROLE_ID = int(os.getenv("WHITELIST_ROLE_ID"))
+ADMIN_ROLE_ID = int(os.getenv("ADMIN_ROLE_ID"))
+# Bilangan carian yang disimpan dalam memori (selebihnya dibaca dari SQLite)
+MUSIC_CACHE_ENTRIES = int(os.getenv("MUSIC_CACHE_ENTRIES", 2000))
+# Thread extraction yt-dlp, dan had extraction serentak bagi satu guild
+MUSIC_EXTRACT_WORKERS = int(os.getenv("MUSIC_EXTRACT_WORKERS", 3))
+MUSIC_EXTRACT_PER_GUILD = int(os.getenv("MUSIC_EXTRACT_PER_GUILD", 2))
+# Had bilangan lagu dalam queue satu guild, had lagu per user (0 = tiada had),
+# dan sama ada lagu yang sudah ada dalam queue boleh ditambah lagi
+MUSIC_MAX_QUEUE = int(os.getenv("MUSIC_MAX_QUEUE", 500))
+MUSIC_USER_QUOTA = int(os.getenv("MUSIC_USER_QUOTA", 0))
+MUSIC_ALLOW_DUPLICATES = os.getenv("MUSIC_ALLOW_DUPLICATES", "0") == "1"
+QUEUE_PAGE_SIZE = 10
+# Panel now playing dikemas kini setiap N saat (progress bar), dan lagu
+# seterusnya yang dipaparkan dalam panel
+MUSIC_PANEL_INTERVAL = float(os.getenv("MUSIC_PANEL_INTERVAL", 10))
+PANEL_UP_NEXT = 5
+# Bila queue habis, bot kekal dalam voice channel selama N saat (0 = keluar
+# terus) supaya /play seterusnya tak perlu connect semula. Sweeper semak
+# guild yang idle setiap IDLE_SWEEP_INTERVAL saat.
+MUSIC_IDLE_TIMEOUT = float(os.getenv("MUSIC_IDLE_TIMEOUT", 300))
+IDLE_SWEEP_INTERVAL = 15
+# Stream URL mesti masih hidup sepanjang lagu + margin ini (saat)
+STREAM_URL_MARGIN = 120
+
+# Bilangan lagu seterusnya yang stream URL-nya disegarkan awal, dan berapa
+# saat sebelum lagu semasa habis source ffmpeg lagu seterusnya dibuka
+MUSIC_PREFETCH_COUNT = int(os.getenv("MUSIC_PREFETCH_COUNT", 2))
+PREFETCH_LEAD = 15
+
+# Cache audio di disk (MB); 0 = tidak digunakan. Lagu ditranscode selepas
+# dimainkan MUSIC_AUDIO_CACHE_MIN_PLAYS kali, paling banyak N transcode serentak
+MUSIC_AUDIO_CACHE_MB = float(os.getenv("MUSIC_AUDIO_CACHE_MB", 0))
+MUSIC_AUDIO_CACHE_MIN_PLAYS = int(os.getenv("MUSIC_AUDIO_CACHE_MIN_PLAYS", 2))
+MUSIC_TRANSCODE_WORKERS = int(os.getenv("MUSIC_TRANSCODE_WORKERS", 2))
+
+FFMPEG_EXECUTABLE = "bin\\ffmpeg\\ffmpeg.exe"
+FFMPEG_OPTIONS = {
+    "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 2",
+    "options": "-vn -c:a libopus -b:a 96k",
+}
+# Sumber sudah opus (webm/opus YouTube): salin paket, tanpa encode semula
+FFMPEG_PASSTHROUGH_OPTIONS = {
+    "before_options": FFMPEG_OPTIONS["before_options"],
+    "options": "-vn",
+}
+
+YDL_OPTIONS = {
+    "format": "bestaudio[abr<=96]/bestaudio",
+    "noplaylist": True,
+    "youtube_include_dash_manifest": False,
+    "youtube_include_hls_manifest": False,
+}
+
+# Playlist/album: senarai entri sahaja (flat), stream URL diambil bila hampir main
+PLAYLIST_OPTIONS = {
+    **YDL_OPTIONS,
+    "noplaylist": False,
+    "extract_flat": "in_playlist",
+}
+
+URL_RE = re.compile(r"https?://\S+")
+
+def seek_options(before_options, start_at):
+    # -ss sebelum -i: ffmpeg lompat terus ke kedudukan (tanpa decode dari awal)
+    if start_at and start_at > 0:
+        return f"{before_options} -ss {start_at:.1f}".strip()
+    return before_options
+
+class MusicControlView(discord.ui.View):
+    """Persistent player buttons, shared by every guild's now-playing panel."""
+
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        voice_client = interaction.guild.voice_client if interaction.guild else None
+        if voice_client is None or not voice_client.is_connected():
+            await interaction.response.send_message("❌ Nothing is playing right now.", ephemeral=True)
+            return False
+        if not interaction.user.voice or interaction.user.voice.channel != voice_client.channel:
+            await interaction.response.send_message("❌ Join my voice channel to use the controls.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(emoji="⏯️", style=discord.ButtonStyle.secondary, custom_id="music_pause_resume")
+    async def pause_resume(self, interaction: discord.Interaction, button: discord.ui.Button):
+        music = interaction.client.get_cog("Music")
+        voice_client = interaction.guild.voice_client
+        guild_id = str(interaction.guild_id)
+        if voice_client.is_playing():
+            music.set_paused(guild_id, voice_client, True)
+        elif voice_client.is_paused():
+            music.set_paused(guild_id, voice_client, False)
+        await music.refresh_panel(interaction)
+
+    @discord.ui.button(emoji="⏭️", style=discord.ButtonStyle.secondary, custom_id="music_skip")
+    async def skip(self, interaction: discord.Interaction, button: discord.ui.Button):
+        music = interaction.client.get_cog("Music")
+        # Jawab dahulu: player mungkin sibuk lebih dari had 3 saat interaction.
+        # Panel dikemas kini bila lagu seterusnya bermula.
+        await interaction.response.defer()
+        await music.player_for(str(interaction.guild_id)).send("skip", interaction.guild.voice_client)
+
+    @discord.ui.button(emoji="⏹️", style=discord.ButtonStyle.danger, custom_id="music_stop")
+    async def stop_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        music = interaction.client.get_cog("Music")
+        await interaction.response.defer()
+        await music.stop_playback(str(interaction.guild_id), interaction.guild.voice_client)
+        embed = discord.Embed(
+            title="Playback Stopped",
+            description=f"⛔️ {interaction.user.mention} stopped playback and disconnected.",
+            color=discord.Color.red()
+        )
+        embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        await interaction.edit_original_response(embed=embed, view=None)
+
+    @discord.ui.button(emoji="📜", style=discord.ButtonStyle.secondary, custom_id="music_queue")
+    async def queue(self, interaction: discord.Interaction, button: discord.ui.Button):
+        music = interaction.client.get_cog("Music")
+        await interaction.response.send_message(embed=music.queue_embed(str(interaction.guild_id)), ephemeral=True)
 
 class Music(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.SONG_QUEUES = {}   # guild_id -> deque of songs
-        self.CURRENT_SONG = {}  # guild_id -> tuple(song info + msg ids + voice_channel_id)
-        self.QUEUE_MESSAGES = {}
+        self.SONG_QUEUES = {}   # guild_id -> SongQueue
+        self.CURRENT_SONG = {}  # guild_id -> NowPlaying
+        self.players = {}       # guild_id -> GuildPlayer
+        self.idle_since = {}    # guild_id -> time.monotonic() bila queue habis
+        # Sesi disimpan ke disk; yang dimuat semasa startup disambung dalam on_ready
+        self.sessions = SessionStore(self.session_snapshot)
+        self.saved_sessions = {}
+        self.panels = PanelUpdater(self.panel_embed, interval=MUSIC_PANEL_INTERVAL)
+        self.controls = MusicControlView()
+        self.track_cache = TrackCache(max_entries=MUSIC_CACHE_ENTRIES)
+        self.extractor = Extractor(max_workers=MUSIC_EXTRACT_WORKERS, per_guild_limit=MUSIC_EXTRACT_PER_GUILD)
+        self.PREFETCHED = {}      # guild_id -> (Track, source ffmpeg yang sedia, mod)
+        self.prefetch_tasks = {}  # guild_id -> asyncio.Task
+        self.audio_cache = None
+        if MUSIC_AUDIO_CACHE_MB > 0:
+            self.audio_cache = AudioCache(
+                max_bytes=int(MUSIC_AUDIO_CACHE_MB * 1024 * 1024),
+                ffmpeg=FFMPEG_EXECUTABLE,
+                min_plays=MUSIC_AUDIO_CACHE_MIN_PLAYS,
+                workers=MUSIC_TRANSCODE_WORKERS,
+                before_options=FFMPEG_OPTIONS["before_options"],
+            )
+
+        self.stream_stats = StreamStats()
+
+    async def cog_load(self):
+        self.saved_sessions = await self.sessions.load_all()
+        self.sessions.start()
+        if self.audio_cache:
+            await self.audio_cache.start()
+        if self.stream_stats.enabled:
+            self.sample_stream_stats.start()
+        if MUSIC_IDLE_TIMEOUT > 0:
+            self.idle_sweeper.start()
+
+    async def cog_unload(self):
+        self.sample_stream_stats.cancel()
+        self.idle_sweeper.cancel()
+        await self.sessions.close()
+        for player in self.players.values():
+            player.close()
+        self.panels.close()
+        for guild_id in list(self.prefetch_tasks):
+            self.cancel_prefetch(guild_id)
+        if self.audio_cache:
+            await self.audio_cache.close()
+        self.extractor.close()
+        await self.track_cache.close()
+
+    def player_for(self, guild_id) -> GuildPlayer:
+        player = self.players.get(guild_id)
+        if player is None:
+            player = self.players[guild_id] = GuildPlayer(guild_id, self.handle_player_event)
+        return player
+
+    def get_queue(self, guild_id) -> SongQueue:
+        queue = self.SONG_QUEUES.get(guild_id)
+        if queue is None:
+            queue = self.SONG_QUEUES[guild_id] = SongQueue(
+                max_size=MUSIC_MAX_QUEUE,
+                per_user_limit=MUSIC_USER_QUOTA,
+                allow_duplicates=MUSIC_ALLOW_DUPLICATES,
+            )
+        return queue
 
     def create_progress_bar(self, current, total, length=20):
         if total == 0:
@@ -24,13 +214,117 @@ class Music(commands.Cog):
         bar = "▮" * filled_length + "▯" * (length - filled_length)
         return bar
 
-    async def search_ytdlp_async(self, query, ydl_opts):
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, lambda: self._extract(query, ydl_opts))
+    async def search_ytdlp_async(self, query, ydl_opts, guild_id=None):
+        return await self.extractor.extract(query, ydl_opts, guild_id)
 
-    def _extract(self, query, ydl_opts):
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            return ydl.extract_info(query, download=False)
+    async def fresh_stream_url(self, video_id, duration, audio_url=None, guild_id=None):
+        """Stream URL for `video_id` that stays valid until the track ends, re-extracted if needed."""
+        if not video_id:
+            return audio_url
+        url = await self.track_cache.stream_url(video_id, min_ttl=duration + STREAM_URL_MARGIN)
+        if url:
+            return url
+        try:
+            info = await self.search_ytdlp_async(f"https://www.youtube.com/watch?v={video_id}", YDL_OPTIONS, guild_id)
+        except (DownloadError, ExtractorError) as e:
+            print(f"Failed to refresh stream URL for {video_id}: {e}")
+            return None
+        await self.track_cache.store(None, info)
+        return info.get("url")
+
+    def create_source(self, audio_url, video_id=None, start_at=0):
+        """(source, mode) for a stream URL; opus streams are passed through without re-encoding.
+
+        `start_at` seeks that many seconds into the track (ffmpeg input seek).
+        """
+        options = FFMPEG_OPTIONS
+        codec = None
+        mode = "transcode"
+        if video_id and self.track_cache.stream_codec(video_id, audio_url) == "opus":
+            options, codec, mode = FFMPEG_PASSTHROUGH_OPTIONS, "opus", "passthrough"
+        options = {**options, "before_options": seek_options(options["before_options"], start_at)}
+        return discord.FFmpegOpusAudio(audio_url, **options, codec=codec, executable=FFMPEG_EXECUTABLE), mode
+
+    def cached_source(self, video_id, start_at=0):
+        """(source, "cache") reading the disk-cached opus file for `video_id`, or None."""
+        path = self.audio_cache.path_for(video_id) if self.audio_cache and video_id else None
+        if path is None:
+            return None
+        # Fail sudah opus; codec "opus" buat ffmpeg salin paket tanpa encode semula
+        source = discord.FFmpegOpusAudio(path, before_options=seek_options("", start_at), codec="opus", executable=FFMPEG_EXECUTABLE)
+        return source, "cache"
+
+    def schedule_prefetch(self, guild_id, duration):
+        task = self.prefetch_tasks.get(guild_id)
+        if task and not task.done():
+            task.cancel()
+        self.prefetch_tasks[guild_id] = asyncio.create_task(self.prefetch(guild_id, duration))
+
+    def reschedule_prefetch(self, guild_id, voice_client):
+        """Re-plan prefetching after the queue changed under the playing track."""
+        queue = self.SONG_QUEUES.get(guild_id)
+        prefetched = self.PREFETCHED.get(guild_id)
+        if prefetched is not None:
+            # Lagu pertama masih sama: source yang sudah dibuka masih sah
+            if queue and prefetched[0] is queue[0]:
+                return
+            self.drop_prefetched(guild_id)
+        current = self.CURRENT_SONG.get(guild_id)
+        if current is None or not queue or voice_client is None:
+            return
+        if not (voice_client.is_playing() or voice_client.is_paused()):
+            return
+        self.schedule_prefetch(guild_id, max(0, current.track.duration - current.elapsed))
+
+    async def prefetch(self, guild_id, duration):
+        """Refresh the next queued stream URLs now, and open the next source just before the current track ends."""
+        queue = self.SONG_QUEUES.get(guild_id)
+        if not queue:
+            return
+        wait = duration
+        for track in [queue[index] for index in range(min(MUSIC_PREFETCH_COUNT, len(queue)))]:
+            if not (self.audio_cache and track.video_id in self.audio_cache):
+                url = await self.fresh_stream_url(track.video_id, wait + track.duration, track.audio_url, guild_id)
+                if url:
+                    track.audio_url = url
+            wait += track.duration
+
+        await asyncio.sleep(max(0, duration - PREFETCH_LEAD))
+        queue = self.SONG_QUEUES.get(guild_id)
+        if not queue:
+            return
+        track = queue[0]
+        prepared = self.cached_source(track.video_id)
+        if prepared is None:
+            url = await self.fresh_stream_url(track.video_id, track.duration, track.audio_url, guild_id)
+            # Queue mungkin berubah semasa menunggu extraction
+            if url is None or not queue or queue[0] is not track:
+                return
+            track.audio_url = url
+            prepared = self.create_source(url, track.video_id)
+        self.drop_prefetched(guild_id)
+        self.PREFETCHED[guild_id] = (track, *prepared)
+
+    def take_prefetched(self, guild_id, track):
+        """(source, mode) for `track` if the prefetcher opened one, else None."""
+        prefetched = self.PREFETCHED.pop(guild_id, None)
+        if prefetched is None:
+            return None
+        if prefetched[0] is track:
+            return prefetched[1:]
+        prefetched[1].cleanup()
+        return None
+
+    def drop_prefetched(self, guild_id):
+        prefetched = self.PREFETCHED.pop(guild_id, None)
+        if prefetched is not None:
+            prefetched[1].cleanup()
+
+    def cancel_prefetch(self, guild_id):
+        task = self.prefetch_tasks.pop(guild_id, None)
+        if task and not task.done():
+            task.cancel()
+        self.drop_prefetched(guild_id)
 
     def check_whitelist():
         async def predicate(interaction: discord.Interaction):
@@ -63,17 +357,118 @@ class Music(commands.Cog):
         elif voice_channel != voice_client.channel:
             await voice_client.move_to(voice_channel)
 
-        ydl_options = {
-            "format": "bestaudio[abr<=96]/bestaudio",
-            "noplaylist": True,
-            "youtube_include_dash_manifest": False,
-            "youtube_include_hls_manifest": False,
-        }
+        guild_id = str(interaction.guild_id)
+        queue = self.get_queue(guild_id)
+
+        # Semak had queue/quota sebelum buat extraction
+        reason = queue.check_room(interaction.user.id)
+        if reason:
+            await self.send_queue_rejection(interaction, reason)
+            return
+
+        # Satu atau lebih URL (video, playlist, album) terus dimasukkan ke queue
+        urls = song_query.split()
+        if all(URL_RE.fullmatch(url) for url in urls):
+            await self.enqueue_urls(interaction, voice_client, urls)
+            return
+
+        # Carian yang pernah dibuat tak perlu extraction lagi; stream URL
+        # diambil semula dalam play_next_song jika sudah tamat tempoh
+        audio_url = None
+        track = await self.track_cache.lookup(song_query)
+        if track is None:
+            track, audio_url = await self.search_track(interaction, song_query)
+            if track is None:
+                return
+
+        queued = Track(audio_url, track.title, track.video_id, track.duration, interaction.user.id)
+        reason = queue.add(queued)
+        if reason:
+            await self.send_queue_rejection(interaction, reason)
+            return
+
+        if voice_client.is_playing() or voice_client.is_paused():
+            embed = discord.Embed(
+                title="Added to Queue",
+                description=f"🎵 **{queued.title}** has been added to the queue (position {len(queue)}).",
+                color=discord.Color.green()
+            )
+            if queued.thumbnail:
+                embed.set_thumbnail(url=queued.thumbnail)
+            embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+            await interaction.followup.send(embed=embed)
+            self.reschedule_prefetch(guild_id, voice_client)
+            self.panels.mark_dirty(guild_id)
+            self.sessions.mark_dirty(guild_id)
+        else:
+            await interaction.followup.send("Starting playback...")
+            await self.player_for(guild_id).send("play", voice_client, interaction.channel)
+
+    async def send_queue_rejection(self, interaction, reason):
+        embed = discord.Embed(
+            title="Cannot Add to Queue",
+            description=f"❌ {reason}",
+            color=discord.Color.red()
+        )
+        embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        await interaction.followup.send(embed=embed)
 
-        query = "ytsearch1:" + song_query
+    async def enqueue_urls(self, interaction, voice_client, urls):
+        """Queue every video in `urls` (playlists expanded flat), starting playback after the first."""
+        guild_id = str(interaction.guild_id)
+        queue = self.get_queue(guild_id)
+        added = skipped = failed = 0
 
+        for url in urls:
+            try:
+                info = await self.search_ytdlp_async(url, PLAYLIST_OPTIONS, guild_id)
+            except (DownloadError, ExtractorError) as e:
+                print(f"Failed to load {url}: {e}")
+                failed += 1
+                continue
+
+            if "entries" in info:
+                entries = info["entries"] or []
+            else:
+                # Video tunggal sudah diextract penuh, simpan dalam cache
+                await self.track_cache.store(url, info)
+                entries = [info]
+
+            for entry in entries:
+                # Entri flat hanya ada URL halaman; video peribadi/dipadam tiada id
+                if not entry or not entry.get("id") or (entry.get("ie_key") or entry.get("extractor_key")) != "Youtube":
+                    skipped += 1
+                    continue
+                audio_url = None if entry.get("_type") == "url" else entry.get("url")
+                track = Track(audio_url, entry.get("title") or "Untitled", entry["id"], entry.get("duration"), interaction.user.id)
+                if queue.add(track):
+                    skipped += 1
+                    continue
+                added += 1
+                if added == 1:
+                    await self.player_for(guild_id).send("play", voice_client, interaction.channel)
+
+        description = f"🎵 Added **{added}** song{'s' if added != 1 else ''} to the queue."
+        if skipped:
+            description += f"\n⚠️ Skipped {skipped} (unavailable, duplicate, or over the queue limit)."
+        if failed:
+            description += f"\n❌ {failed} link{'s' if failed != 1 else ''} could not be loaded."
+        embed = discord.Embed(
+            title="Added to Queue" if added else "Nothing Added",
+            description=description,
+            color=discord.Color.green() if added else discord.Color.red()
+        )
+        embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        await interaction.followup.send(embed=embed)
+        if added:
+            self.reschedule_prefetch(guild_id, voice_client)
+        self.panels.mark_dirty(guild_id)
+        self.sessions.mark_dirty(guild_id)
+
+    async def search_track(self, interaction, song_query):
+        """Run a ytsearch1 extraction and cache it; returns (TrackInfo, stream URL) or (None, None)."""
         try:
-            results = await self.search_ytdlp_async(query, ydl_options)
+            results = await self.search_ytdlp_async("ytsearch1:" + song_query, YDL_OPTIONS, str(interaction.guild_id))
         except (DownloadError, ExtractorError) as e:
             embed = discord.Embed(
                 title="Cannot Play Song",
@@ -82,7 +477,7 @@ class Music(commands.Cog):
             )
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
             await interaction.followup.send(embed=embed)
-            return
+            return None, None
         except Exception as e:
             embed = discord.Embed(
                 title="Error",
@@ -91,7 +486,7 @@ class Music(commands.Cog):
             )
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
             await interaction.followup.send(embed=embed)
-            return
+            return None, None
 
         tracks = results.get("entries", [])
         if not tracks:
@@ -102,125 +497,329 @@ class Music(commands.Cog):
             )
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
             await interaction.followup.send(embed=embed)
-            return
+            return None, None
 
         first_track = tracks[0]
-        audio_url = first_track["url"]
-        title = first_track.get("title", "Untitled")
-        video_id = first_track.get("id")
-        duration = first_track.get("duration", 0)
-        requester = interaction.user.mention
-
-        guild_id = str(interaction.guild_id)
-        if guild_id not in self.SONG_QUEUES:
-            self.SONG_QUEUES[guild_id] = deque()
-
-        self.SONG_QUEUES[guild_id].append((audio_url, title, video_id, duration, requester))
+        track = await self.track_cache.store(song_query, first_track)
+        return track, first_track["url"]
+
+    async def handle_player_event(self, player, event, *args):
+        """Runs in the guild's player task; events are handled one at a time."""
+        guild_id = player.guild_id
+        if event == "ended":
+            generation, voice_client, channel, error = args
+            if error:
+                print(f"Error during playback in guild {guild_id}: {error}")
+            # Lagu ini sudah diganti (skip diikuti play) atau player dihentikan
+            if generation != player.generation:
+                return
+            if not voice_client.is_connected():
+                if self.bot.is_closed() or not self.bot.is_ready():
+                    # Gateway terputus atau bot sedang shutdown: kekalkan lagu dan
+                    # queue supaya resume_sessions (on_ready) boleh sambung semula
+                    self.panels.detach(guild_id)
+                    self.cancel_prefetch(guild_id)
+                    self.stream_stats.finish(guild_id)
+                    return
+                # Voice sahaja yang terputus (dikick, channel dipadam, atau discord.py
+                # gagal reconnect): on_ready takkan dipanggil, jadi buang queue dan
+                # sesi supaya /play seterusnya tak mainkan queue lama dulu
+                await self.leave_voice(guild_id, voice_client)
+                try:
+                    await channel.send("⏹️ Disconnected from the voice channel, the queue has been cleared.")
+                except discord.HTTPException:
+                    pass
+                return
+            await self.play_next_song(player, voice_client, channel)
+        elif event == "play":
+            voice_client, channel = args
+            if not (voice_client.is_playing() or voice_client.is_paused()):
+                await self.play_next_song(player, voice_client, channel)
+        elif event == "skip":
+            voice_client, = args
+            if voice_client is None or not (voice_client.is_playing() or voice_client.is_paused()):
+                return False
+            # Event "ended" dari lagu ini akan mulakan lagu seterusnya
+            voice_client.stop()
+            return True
+        elif event == "stop":
+            voice_client, = args
+            player.next_generation()
+            if voice_client.is_playing() or voice_client.is_paused():
+                voice_client.stop()
+            await self.leave_voice(guild_id, voice_client)
+        elif event == "idle":
+            voice_client, = args
+            # Lagu baru mungkin sudah bermula sejak sweeper hantar event ini
+            if guild_id in self.idle_since and not (voice_client.is_playing() or voice_client.is_paused()):
+                await self.leave_voice(guild_id, voice_client)
+        elif event == "resume":
+            data, = args
+            await self.resume_session(player, data)
+
+    async def resume_session(self, player, data):
+        """Reconnect and continue a saved session from its stored position."""
+        guild_id = player.guild_id
+        voice_channel = self.bot.get_channel(data["voice_channel_id"])
+        channel = self.bot.get_channel(data["channel_id"])
+        if voice_channel is None or channel is None:
+            # Channel sudah dipadam; buang sesi dari disk
+            self.sessions.mark_dirty(guild_id)
+            return
 
+        voice_client = voice_channel.guild.voice_client
+        if voice_client is None:
+            voice_client = await voice_channel.connect()
+        elif voice_client.channel.id != voice_channel.id:
+            await voice_client.move_to(voice_channel)
         if voice_client.is_playing() or voice_client.is_paused():
-            embed = discord.Embed(
-                title="Added to Queue",
-                description=f"🎵 **{title}** has been added to the queue.",
-                color=discord.Color.green()
-            )
-            if video_id:
-                embed.set_thumbnail(url=f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg")
-            embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
-            await interaction.followup.send(embed=embed)
-        else:
-            await interaction.followup.send("Starting playback...")
-            await self.play_next_song(voice_client, guild_id, interaction.channel)
-
-    async def play_next_song(self, voice_client, guild_id, channel):
-        if self.SONG_QUEUES.get(guild_id):
-            audio_url, title, video_id, duration, requester = self.SONG_QUEUES[guild_id].popleft()
-
-            start_time = datetime.datetime.now(datetime.timezone.utc)
+            return
 
-            # Simpan voice_channel_id untuk reconnect nanti
-            voice_channel_id = voice_client.channel.id if voice_client.channel else None
+        queue = self.get_queue(guild_id)
+        queue.clear()
+        for entry in data["queue"]:
+            queue.restore(Track.from_dict(entry))
+        current = data["current"]
+        queue.add_front(Track.from_dict(current))
+        await self.play_next_song(player, voice_client, channel, start_at=current["position"])
+        if current.get("paused") and voice_client.is_playing():
+            self.set_paused(guild_id, voice_client, True)
+
+    async def play_next_song(self, player, voice_client, channel, start_at=0):
+        """Start the next playable track, or leave the voice channel when the queue is empty.
+
+        `start_at` resumes the first track that many seconds in.
+        """
+        guild_id = player.guild_id
+        queue = self.get_queue(guild_id)
+        prepared = None
+        while prepared is None and queue and voice_client.is_connected():
+            track = queue.popleft()
+            if start_at:
+                # Source yang sudah dibuka bermula dari awal; buka semula dengan seek
+                self.drop_prefetched(guild_id)
+                prepared = self.cached_source(track.video_id, start_at)
+            else:
+                prepared = self.take_prefetched(guild_id, track) or self.cached_source(track.video_id)
+            if prepared is None:
+                # Stream URL dalam queue mungkin sudah tamat tempoh; ambil yang segar
+                track.audio_url = await self.fresh_stream_url(track.video_id, track.duration, track.audio_url, guild_id)
+                if track.audio_url is None:
+                    await channel.send(f"⚠️ Could not load **{track.title}**, skipping.")
+                    start_at = 0
+                    continue
+                prepared = self.create_source(track.audio_url, track.video_id, start_at)
+
+        if prepared is None:
+            # No songs left: kekal connected sehingga idle timeout
+            await self.go_idle(guild_id, voice_client)
+            return
+        source, mode = prepared
+        self.idle_since.pop(guild_id, None)
 
-            # Simpan current song info + message ids + voice channel id
-            self.CURRENT_SONG[guild_id] = (audio_url, title, video_id, duration, requester, start_time, None, channel.id, voice_channel_id)
+        start_time = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=start_at)
 
-            ffmpeg_options = {
-                "before_options": "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 2",
-                "options": "-vn -c:a libopus -b:a 96k",
-            }
+        # Simpan voice_channel_id untuk reconnect nanti
+        voice_channel_id = voice_client.channel.id if voice_client.channel else None
 
-            source = discord.FFmpegOpusAudio(audio_url, **ffmpeg_options, executable="bin\\ffmpeg\\ffmpeg.exe")
+        # Simpan current song info + message id + voice channel id
+        now_playing = NowPlaying(track, start_time, None, channel.id, voice_channel_id)
+        self.CURRENT_SONG[guild_id] = now_playing
 
-            def after_play(error):
-                if error:
-                    print(f"Error playing {title}: {error}")
-                fut = asyncio.run_coroutine_threadsafe(self.play_next_song(voice_client, guild_id, channel), self.bot.loop)
-                try:
-                    fut.result()
-                except Exception as e:
-                    print(f"Error in after_play future: {e}")
+        generation = player.next_generation()
 
-            voice_client.play(source, after=after_play)
+        def after_play(error):
+            # Thread audio: hantar isyarat sahaja, player task buat selebihnya
+            player.post("ended", generation, voice_client, channel, error)
 
-            embed = discord.Embed(
-                title="Now Playing",
-                description=f"🎶 {title}",
-                color=discord.Color.blue()
-            )
-            if video_id:
-                embed.set_thumbnail(url=f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg")
-            embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        voice_client.play(source, after=after_play)
+        self.stream_stats.watch(guild_id, source, mode, track.title)
+        self.schedule_prefetch(guild_id, max(0, track.duration - start_at))
+        if self.audio_cache:
+            self.audio_cache.record_play(track.video_id, track.audio_url)
 
-            msg = await channel.send(embed=embed)
-            # Update message id for reaction control
-            self.CURRENT_SONG[guild_id] = (audio_url, title, video_id, duration, requester, start_time, msg.id, channel.id, voice_channel_id)
-
-            for emoji in ["⏸️", "▶️", "⏭️", "⏹️"]:
-                await msg.add_reaction(emoji)
-
-            await self.update_queue_message(guild_id)
+        # Guna semula panel lagu sebelum ini (satu edit), atau hantar baru
+        embed = self.panel_embed(guild_id)
+        msg = self.panels.message_for(guild_id)
+        if msg is not None and msg.channel.id == channel.id:
+            try:
+                await msg.edit(embed=embed)
+            except discord.HTTPException:
+                msg = None
         else:
-            # No songs left: cleanup
-            if guild_id in self.CURRENT_SONG:
-                del self.CURRENT_SONG[guild_id]
-            await voice_client.disconnect()
-            self.SONG_QUEUES[guild_id] = deque()
-
-    async def update_queue_message(self, guild_id):
-        queue = self.SONG_QUEUES.get(guild_id)
-        if not queue:
+            msg = None
+        if msg is None:
+            msg = await channel.send(embed=embed, view=self.controls)
+        now_playing.message_id = msg.id
+        # Mesej ini jadi panel live (progress bar + lagu seterusnya)
+        self.panels.attach(guild_id, msg, embed)
+        self.sessions.mark_dirty(guild_id)
+
+    async def go_idle(self, guild_id, voice_client):
+        """Clear the finished track but keep the voice connection for MUSIC_IDLE_TIMEOUT seconds."""
+        if MUSIC_IDLE_TIMEOUT <= 0 or not voice_client.is_connected():
+            await self.leave_voice(guild_id, voice_client)
             return
+        self.CURRENT_SONG.pop(guild_id, None)
+        self.cancel_prefetch(guild_id)
+        self.stream_stats.finish(guild_id)
+        self.panels.detach(guild_id)
+        self.sessions.mark_dirty(guild_id)
+        self.idle_since[guild_id] = time.monotonic()
+
+    async def leave_voice(self, guild_id, voice_client):
+        """Forget the guild's playback state and disconnect."""
+        self.idle_since.pop(guild_id, None)
+        self.CURRENT_SONG.pop(guild_id, None)
+        self.get_queue(guild_id).clear()
+        self.cancel_prefetch(guild_id)
+        self.stream_stats.finish(guild_id)
+        self.panels.detach(guild_id)
+        self.sessions.mark_dirty(guild_id)
+        if voice_client.is_connected():
+            await voice_client.disconnect()
 
-        description = ""
-        for i, (_, title, _, _, _) in enumerate(queue, start=1):
-            description += f"{i}. {title}\n"
+    def session_snapshot(self, guild_id):
+        """What `resume_session` needs to continue the guild's playback, or None if nothing is playing."""
+        current = self.CURRENT_SONG.get(guild_id)
+        if current is None or not current.voice_channel_id or not current.track.video_id:
+            return None
+        return {
+            "channel_id": current.channel_id,
+            "voice_channel_id": current.voice_channel_id,
+            "current": {**current.track.to_dict(), "position": round(current.elapsed, 1), "paused": current.paused},
+            "queue": [track.to_dict() for track in self.get_queue(guild_id) if track.video_id],
+        }
 
+    async def resume_sessions(self):
+        """Resume playback after startup or a gateway reconnect.
+
+        Guilds still in memory resume from their live state; the rest come
+        from the sessions saved before the last shutdown or crash.
+        """
+        sessions = {guild_id: self.session_snapshot(guild_id) for guild_id in list(self.CURRENT_SONG)}
+        for guild_id, data in self.saved_sessions.items():
+            sessions.setdefault(guild_id, data)
+        self.saved_sessions = {}
+        for guild_id, data in sessions.items():
+            if data is None:
+                continue
+            try:
+                await self.player_for(guild_id).send("resume", data)
+            except Exception as e:
+                print(f"Failed to resume music session for guild {guild_id}: {e}")
+
+    @tasks.loop(seconds=IDLE_SWEEP_INTERVAL)
+    async def idle_sweeper(self):
+        """Disconnect idle guilds whose grace period is over or whose channel has no listeners left."""
+        now = time.monotonic()
+        for guild_id, since in list(self.idle_since.items()):
+            guild = self.bot.get_guild(int(guild_id))
+            voice_client = guild.voice_client if guild else None
+            if voice_client is None or not voice_client.is_connected():
+                # Sudah keluar (kick, putus sambungan); tiada apa nak dibuat
+                self.idle_since.pop(guild_id, None)
+                continue
+            listeners = [member for member in voice_client.channel.members if not member.bot]
+            if now - since >= MUSIC_IDLE_TIMEOUT or not listeners:
+                self.player_for(guild_id).post("idle", voice_client)
+
+    @idle_sweeper.before_loop
+    async def before_idle_sweeper(self):
+        await self.bot.wait_until_ready()
+
+    def queue_embed(self, guild_id, page=1):
+        """Embed for one page of the guild's queue; only that page is rendered."""
+        queue = self.get_queue(guild_id)
+        pages = queue.page_count(QUEUE_PAGE_SIZE)
+        page = min(max(page, 1), pages)
+        lines = [
+            f"`{position}.` {track.title[:80]} `[{format_duration(track.duration)}]` • {track.requester}"
+            for position, track in queue.page(page, QUEUE_PAGE_SIZE)
+        ]
         embed = discord.Embed(
             title="Current Song Queue",
-            description=description,
+            description="\n".join(lines) or "🚫 The queue is empty.",
             color=discord.Color.blue()
         )
+        embed.set_footer(
+            text=f"Page {page}/{pages} • {len(queue)} songs ({format_duration(queue.total_duration)}) • Powered by ALPHA™"
+        )
+        return embed
+
+    def panel_embed(self, guild_id):
+        """Live now-playing panel: progress of the current track and the next few in the queue."""
+        current = self.CURRENT_SONG.get(guild_id)
+        if current is None:
+            return None
+        track = current.track
+        elapsed = current.elapsed
+        status = "⏸️ Paused" if current.paused else "🎶 Playing"
+
+        embed = discord.Embed(
+            title="Now Playing",
+            description=(
+                f"🎶 **{track.title}**\n\n"
+                f"Requested by: {track.requester}\n"
+                f"{status} • `{format_duration(elapsed)}` / `{format_duration(track.duration)}`\n"
+                f"{self.create_progress_bar(elapsed, track.duration)}"
+            ),
+            color=discord.Color.blue()
+        )
+        if track.thumbnail:
+            embed.set_thumbnail(url=track.thumbnail)
+
+        queue = self.get_queue(guild_id)
+        if queue:
+            lines = [f"`{position}.` {queued.title[:60]}" for position, queued in queue.page(1, PANEL_UP_NEXT)]
+            if len(queue) > PANEL_UP_NEXT:
+                lines.append(f"…and {len(queue) - PANEL_UP_NEXT} more ({format_duration(queue.total_duration)} total)")
+            embed.add_field(name="Up Next", value="\n".join(lines), inline=False)
         embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        return embed
 
-        msg = self.QUEUE_MESSAGES.get(guild_id)
-        if msg:
-            try:
-                await msg.edit(embed=embed)
-            except Exception as e:
-                print(f"Failed to edit queue message for guild {guild_id}: {e}")
+    async def refresh_panel(self, interaction):
+        """Answer a control press by editing the panel it came from, in the same call."""
+        guild_id = str(interaction.guild_id)
+        current = self.CURRENT_SONG.get(guild_id)
+        embed = self.panel_embed(guild_id)
+        if embed is None or current is None or interaction.message.id != current.message_id:
+            await interaction.response.defer()
+            return
+        await interaction.response.edit_message(embed=embed)
+        self.panels.mark_rendered(guild_id, embed)
+
+    async def stop_playback(self, guild_id, voice_client):
+        """Clear the queue, stop the current track and leave the voice channel."""
+        await self.player_for(guild_id).send("stop", voice_client)
+
+    def set_paused(self, guild_id, voice_client, paused):
+        if paused:
+            voice_client.pause()
+        else:
+            voice_client.resume()
+        current = self.CURRENT_SONG.get(guild_id)
+        if current is not None and paused:
+            current.pause()
+        elif current is not None:
+            current.resume()
+        self.panels.mark_dirty(guild_id)
+        self.sessions.mark_dirty(guild_id)
 
     @check_whitelist()
     @app_commands.command(name="skip", description="Skips the current playing song")
     async def skip(self, interaction: discord.Interaction):
-        voice_client = interaction.guild.voice_client
-        if voice_client and (voice_client.is_playing() or voice_client.is_paused()):
-            voice_client.stop()
+        # Player mungkin sibuk (refresh stream URL); jawab interaction dahulu
+        await interaction.response.defer()
+        skipped = await self.player_for(str(interaction.guild_id)).send("skip", interaction.guild.voice_client)
+        if skipped:
             embed = discord.Embed(
                 title="Skipped",
                 description="⏭️ Skipped the current song.",
                 color=discord.Color.orange()
             )
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
-            await interaction.response.send_message(embed=embed)
+            await interaction.followup.send(embed=embed)
         else:
             embed = discord.Embed(
                 title="Nothing to Skip",
@@ -228,7 +827,7 @@ class Music(commands.Cog):
                 color=discord.Color.red()
             )
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
-            await interaction.response.send_message(embed=embed)
+            await interaction.followup.send(embed=embed)
 
     @check_whitelist()
     @app_commands.command(name="pause", description="Pause the currently playing song.")
@@ -253,7 +852,7 @@ class Music(commands.Cog):
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
             return await interaction.response.send_message(embed=embed)
 
-        voice_client.pause()
+        self.set_paused(str(interaction.guild_id), voice_client, True)
         embed = discord.Embed(
             title="Paused",
             description="⏸️ Playback paused!",
@@ -285,7 +884,7 @@ class Music(commands.Cog):
             embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
             return await interaction.response.send_message(embed=embed)
 
-        voice_client.resume()
+        self.set_paused(str(interaction.guild_id), voice_client, False)
         embed = discord.Embed(
             title="Playback Resumed",
             description="▶️ Playback has been resumed!",
@@ -312,15 +911,7 @@ class Music(commands.Cog):
             await interaction.followup.send(embed=embed)
             return
 
-        guild_id_str = str(interaction.guild_id)
-        if guild_id_str in self.SONG_QUEUES:
-            self.SONG_QUEUES[guild_id_str].clear()
-
-        if voice_client.is_playing() or voice_client.is_paused():
-            voice_client.stop()
-
-        await asyncio.sleep(1)
-        await voice_client.disconnect()
+        await self.stop_playback(str(interaction.guild_id), voice_client)
 
         embed = discord.Embed(
             title="Playback Stopped",
@@ -333,7 +924,8 @@ class Music(commands.Cog):
 
     @check_whitelist()
     @app_commands.command(name="queue", description="Show the current song queue.")
-    async def queue(self, interaction: discord.Interaction):
+    @app_commands.describe(page="Page number")
+    async def queue(self, interaction: discord.Interaction, page: app_commands.Range[int, 1] = 1):
         guild_id = str(interaction.guild_id)
         queue = self.SONG_QUEUES.get(guild_id)
 
@@ -347,20 +939,67 @@ class Music(commands.Cog):
             await interaction.response.send_message(embed=embed)
             return
 
-        description = ""
-        for i, (_, title, _, _, _) in enumerate(queue, start=1):
-            description += f"{i}. {title}\n"
+        embed = self.queue_embed(guild_id, page)
 
+        await interaction.response.send_message(embed=embed)
+
+    async def edit_queue(self, interaction, action):
+        """Run `action(queue)` on a non-empty queue and reply with its message, or an error."""
+        guild_id = str(interaction.guild_id)
+        queue = self.SONG_QUEUES.get(guild_id)
+        try:
+            if not queue:
+                raise IndexError
+            description = action(queue)
+        except IndexError:
+            embed = discord.Embed(
+                title="Invalid Position",
+                description=f"❌ Choose a position between 1 and {len(queue) if queue else 0}.",
+                color=discord.Color.red()
+            )
+            embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        # Lagu pertama mungkin berubah; sediakan semula lagu seterusnya
+        self.reschedule_prefetch(guild_id, interaction.guild.voice_client)
         embed = discord.Embed(
-            title="Current Song Queue",
+            title="Queue Updated",
             description=description,
-            color=discord.Color.blue()
+            color=discord.Color.green()
         )
         embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
-
         await interaction.response.send_message(embed=embed)
-        msg = await interaction.original_response()
-        self.QUEUE_MESSAGES[guild_id] = msg
+        self.panels.mark_dirty(guild_id)
+        self.sessions.mark_dirty(guild_id)
+
+    @check_whitelist()
+    @app_commands.command(name="remove", description="Remove a song from the queue.")
+    @app_commands.describe(position="Queue position to remove")
+    async def remove(self, interaction: discord.Interaction, position: app_commands.Range[int, 1]):
+        def action(queue):
+            track = queue.remove(position - 1)
+            return f"🗑️ Removed **{track.title}** from the queue."
+        await self.edit_queue(interaction, action)
+
+    @check_whitelist()
+    @app_commands.command(name="move", description="Move a song to another position in the queue.")
+    @app_commands.describe(from_position="Current queue position", to_position="New queue position")
+    async def move(self, interaction: discord.Interaction, from_position: app_commands.Range[int, 1], to_position: app_commands.Range[int, 1]):
+        def action(queue):
+            if to_position > len(queue):
+                raise IndexError
+            track = queue.move(from_position - 1, to_position - 1)
+            return f"↕️ Moved **{track.title}** to position {to_position}."
+        await self.edit_queue(interaction, action)
+
+    @check_whitelist()
+    @app_commands.command(name="shuffle", description="Shuffle the song queue.")
+    async def shuffle(self, interaction: discord.Interaction):
+        def action(queue):
+            queue.shuffle()
+            return f"🔀 Shuffled {len(queue)} songs."
+        await self.edit_queue(interaction, action)
 
     @check_whitelist()
     @app_commands.command(name="nowplaying", description="Show the currently playing song with details.")
@@ -389,80 +1028,61 @@ class Music(commands.Cog):
             await interaction.response.send_message(embed=embed)
             return
 
-        audio_url, title, video_id, duration, requester, start_time, _, _ , _ = current
-
-        now = datetime.datetime.now(datetime.timezone.utc)
-        elapsed = (now - start_time).total_seconds()
-        if elapsed > duration:
-            elapsed = duration
+        await interaction.response.send_message(embed=self.panel_embed(guild_id))
 
-        progress_bar = self.create_progress_bar(elapsed, duration)
+    @app_commands.command(name="audiocache", description="Show music audio cache statistics.")
+    async def audiocache(self, interaction: discord.Interaction):
+        if not has_role(interaction.user, ADMIN_ROLE_ID):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
+            return
+        if self.audio_cache is None:
+            await interaction.response.send_message("ℹ️ The audio cache is disabled (set `MUSIC_AUDIO_CACHE_MB`).", ephemeral=True)
+            return
 
+        stats = self.audio_cache.stats()
         embed = discord.Embed(
-            title="Now Playing",
+            title="Audio Cache",
             description=(
-                f"🎶 **{title}**\n\n"
-                f"Requested by: {requester}\n"
-                f"Duration: `{int(elapsed)//60}:{int(elapsed)%60:02d}` / `{duration//60}:{duration%60:02d}`\n"
-                f"{progress_bar}"
+                f"**Files:** {stats['files']}\n"
+                f"**Size:** {stats['bytes'] / 1024 / 1024:.1f} / {stats['max_bytes'] / 1024 / 1024:.0f} MB\n"
+                f"**Hit rate:** {stats['hit_rate']:.1%} ({stats['hits']} hits, {stats['misses']} misses)\n"
+                f"**Transcoded:** {stats['transcodes']} ({stats['pending']} in progress)"
             ),
             color=discord.Color.blue()
         )
-        if video_id:
-            embed.set_thumbnail(url=f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg")
         embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
-        await interaction.response.send_message(embed=embed)
-
-    @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        if user.bot:
-            return
-
-        message = reaction.message
-        guild = message.guild
-        if guild is None:
-            return
-        voice_client = guild.voice_client
-        if voice_client is None:
-            return
-
-        guild_id = str(guild.id)
-        current_song_data = self.CURRENT_SONG.get(guild_id)
-        if not current_song_data:
-            return
-        if len(current_song_data) < 9:
-            return
+    @tasks.loop(seconds=5)
+    async def sample_stream_stats(self):
+        self.stream_stats.sample_all()
 
-        message_id = current_song_data[6]
-        if message.id != message_id:
+    @app_commands.command(name="streamstats", description="Show ffmpeg CPU usage per music playback mode.")
+    async def streamstats(self, interaction: discord.Interaction):
+        if not has_role(interaction.user, ADMIN_ROLE_ID):
+            await interaction.response.send_message("❌ You do not have permission to use this command.", ephemeral=True)
             return
-
-        if not user.voice or user.voice.channel != voice_client.channel:
+        if not self.stream_stats.enabled:
+            await interaction.response.send_message("ℹ️ Stream stats need the `psutil` package.", ephemeral=True)
             return
 
-        emoji = str(reaction.emoji)
-
-        try:
-            await message.remove_reaction(emoji, user)
-        except:
-            pass
-
-        if emoji == "⏸️":
-            if voice_client.is_playing():
-                voice_client.pause()
-                await message.channel.send(f"{user.mention} paused the music.")
-        elif emoji == "▶️":
-            if voice_client.is_paused():
-                voice_client.resume()
-                await message.channel.send(f"{user.mention} resumed the music.")
-        elif emoji == "⏭️":
-            voice_client.stop()
-            await message.channel.send(f"{user.mention} skipped the music.")
-        elif emoji == "⏹️":
-            await voice_client.disconnect()
-            self.SONG_QUEUES[guild_id].clear()
-            await message.channel.send(f"{user.mention} stopped playback and disconnected.")
+        lines = []
+        for mode, (streams, cpu, wall) in self.stream_stats.totals.items():
+            usage = f"{cpu / wall:.2%} CPU" if wall else "-"
+            lines.append(f"**{mode.title()}:** {streams} streams • {usage} ({cpu:.0f}s CPU over {wall / 60:.0f} min)")
+        embed = discord.Embed(
+            title="Stream Stats",
+            description="\n".join(lines),
+            color=discord.Color.blue()
+        )
+        playing = [
+            f"`{guild_id}` {mode} • {cpu / wall:.2%} CPU" if wall else f"`{guild_id}` {mode}"
+            for guild_id, mode, cpu, wall in self.stream_stats.current()
+        ]
+        if playing:
+            embed.add_field(name="Playing Now", value="\n".join(playing)[:1024], inline=False)
+        embed.set_footer(text="Powered by ALPHA™ • Use /info for commands")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
 async def setup(bot):
     await bot.add_cog(Music(bot))
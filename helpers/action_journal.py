@@ -0,0 +1,211 @@
+# helpers/action_journal.py
+#
+# Jurnal append-only untuk semua event action log, dalam SQLite.
+# Event ditulis berkelompok (satu transaction setiap beberapa saat), dan
+# indeks (guild, user, jenis, masa) buat /logsearch jawab dalam milisaat.
+# Rekod lebih lama dari tempoh simpanan dibuang secara berkala.
+
+import os
+import time
+import asyncio
+
+from helpers.db_helpers import SQLiteWorker
+
+DATA_FOLDER = "data"
+JOURNAL_DB_PATH = os.path.join(DATA_FOLDER, "action_journal.db")
+
+EVENT_TYPES = {
+    "message_edit": "📝 Message Edited",
+    "message_delete": "🗑️ Message Deleted",
+    "bulk_delete": "🧹 Bulk Delete",
+    "nickname": "✏️ Nickname Changed",
+    "role_change": "🔁 Roles Updated",
+    "ban": "⛔ Member Banned",
+    "unban": "✅ Member Unbanned",
+}
+
+CREATE_JOURNAL_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS action_journal (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        guild_id INTEGER NOT NULL,
+        user_id INTEGER,
+        channel_id INTEGER,
+        event_type TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        summary TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_journal_user ON action_journal (guild_id, user_id, event_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_journal_type ON action_journal (guild_id, event_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_journal_time ON action_journal (guild_id, created_at)",
+]
+
+INSERT_JOURNAL_SQL = """
+    INSERT INTO action_journal (guild_id, user_id, channel_id, event_type, created_at, summary)
+    VALUES (?, ?, ?, ?, ?, ?);
+"""
+
+MAX_SUMMARY_LENGTH = 1000
+
+
+class JournalEntry:
+    __slots__ = ("id", "guild_id", "user_id", "channel_id", "event_type", "created_at", "summary")
+
+    def __init__(self, id, guild_id, user_id, channel_id, event_type, created_at, summary):
+        self.id = id
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.event_type = event_type
+        self.created_at = created_at
+        self.summary = summary
+
+
+class ActionJournal:
+    """Batched, indexed, append-only store of action-log events."""
+
+    def __init__(self, path: str = JOURNAL_DB_PATH, flush_interval: float = 2.0, flush_threshold: int = 200,
+                 retention_days: int = 90, compact_interval: float = 6 * 3600):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+        self._worker = SQLiteWorker(path, name="action-journal")
+        self._worker.run_sync(self._create_tables)
+        self._pending = []
+        self._wake = asyncio.Event()
+        self._task = None
+        self._closing = False
+
+    @staticmethod
+    def _create_tables(connection):
+        with connection:
+            for statement in CREATE_JOURNAL_SQL:
+                connection.execute(statement)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    def record(self, guild_id: int, event_type: str, user_id: int = None, channel_id: int = None,
+               summary: str = "", created_at: float = None):
+        """Queue one event; it is written with the next batch."""
+        if summary and len(summary) > MAX_SUMMARY_LENGTH:
+            summary = summary[:MAX_SUMMARY_LENGTH - 1] + "…"
+        self._pending.append((
+            guild_id,
+            user_id,
+            channel_id,
+            event_type,
+            time.time() if created_at is None else created_at,
+            summary,
+        ))
+        if len(self._pending) >= self.flush_threshold:
+            self._wake.set()
+
+    async def _flush_loop(self):
+        next_compact = time.monotonic() + 60
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+            if time.monotonic() >= next_compact:
+                next_compact = time.monotonic() + self.compact_interval
+                try:
+                    removed = await self.compact()
+                    if removed:
+                        print(f"Action journal: removed {removed} entries older than {self.retention_days} days.")
+                except Exception as e:
+                    print(f"Action journal compaction failed: {e}")
+
+    async def flush(self):
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+
+        def job(connection):
+            with connection:
+                connection.executemany(INSERT_JOURNAL_SQL, rows)
+        try:
+            await self._worker.run(job)
+        except Exception as e:
+            print(f"Failed to write {len(rows)} action journal entries: {e}")
+            self._pending[:0] = rows
+
+    async def compact(self) -> int:
+        """Drop entries past the retention period and tidy the database file."""
+        cutoff = time.time() - self.retention_days * 86400
+
+        def job(connection):
+            removed = 0
+            # Padam sikit-sikit supaya transaction tak terlalu besar
+            while True:
+                with connection:
+                    cursor = connection.execute("""
+                        DELETE FROM action_journal WHERE id IN (
+                            SELECT id FROM action_journal WHERE created_at < ? LIMIT 5000
+                        );
+                    """, (cutoff,))
+                removed += cursor.rowcount
+                if cursor.rowcount < 5000:
+                    break
+            connection.execute("PRAGMA optimize;")
+            connection.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+            return removed
+        return await self._worker.run(job)
+
+    async def search(self, guild_id: int, user_id: int = None, event_type: str = None, since: float = None,
+                     cursor: tuple = None, limit: int = 10):
+        """Return (entries, next_cursor), newest first.
+
+        `cursor` is the value returned by the previous page (keyset
+        pagination on created_at/id), None for the first page.
+        """
+        clauses = ["guild_id = ?"]
+        params = [guild_id]
+        if user_id is not None:
+            clauses.append("user_id = ?")
+            params.append(user_id)
+        if event_type is not None:
+            clauses.append("event_type = ?")
+            params.append(event_type)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if cursor is not None:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(cursor)
+        sql = f"""
+            SELECT id, guild_id, user_id, channel_id, event_type, created_at, summary
+            FROM action_journal
+            WHERE {' AND '.join(clauses)}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?;
+        """
+        params.append(limit + 1)
+
+        # Pastikan event terkini sudah ditulis sebelum cari
+        await self.flush()
+        rows = await self._worker.run(lambda connection: connection.execute(sql, params).fetchall())
+        entries = [JournalEntry(*row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = entries[-1]
+            next_cursor = (last.created_at, last.id)
+        return entries, next_cursor
+
+    async def close(self):
+        self._closing = True
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+        await self._worker.close()
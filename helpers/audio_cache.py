@@ -0,0 +1,179 @@
+# helpers/audio_cache.py
+#
+# Cache audio muzik di disk. Lagu yang dimainkan beberapa kali ditranscode
+# sekali ke fail .ogg (opus) di latar belakang, kemudian dimainkan terus dari
+# disk tanpa download atau encode semula. Saiz folder dihadkan; fail yang
+# paling lama tak dimainkan dibuang dahulu (LRU).
+
+import os
+import asyncio
+from collections import OrderedDict, Counter
+
+DATA_FOLDER = "data"
+AUDIO_CACHE_FOLDER = os.path.join(DATA_FOLDER, "audio_cache")
+AUDIO_EXTENSION = ".ogg"
+
+
+class AudioCache:
+    """Size-bounded LRU of transcoded opus files, filled by a small transcode pool.
+
+    A track is transcoded once it has been played `min_plays` times; at most
+    `workers` ffmpeg transcodes run at once.
+    """
+
+    def __init__(self, max_bytes: int, ffmpeg: str, folder: str = AUDIO_CACHE_FOLDER, min_plays: int = 2,
+                 workers: int = 2, bitrate: str = "96k", before_options: str = ""):
+        self.max_bytes = max_bytes
+        self.ffmpeg = ffmpeg
+        self.folder = folder
+        self.min_plays = min_plays
+        self.bitrate = bitrate
+        self.before_options = before_options.split()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.transcodes = 0
+        # video_id -> saiz fail, susunan LRU (paling lama dahulu)
+        self._files = OrderedDict()
+        self._plays = Counter()
+        self._jobs = {}
+        self._slots = asyncio.Semaphore(workers)
+
+    def _path(self, video_id):
+        return os.path.join(self.folder, video_id + AUDIO_EXTENSION)
+
+    def _scan(self):
+        os.makedirs(self.folder, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith(".part"):
+                # Transcode yang terputus sebelum ini
+                os.remove(entry.path)
+            elif entry.name.endswith(AUDIO_EXTENSION):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-len(AUDIO_EXTENSION)], stat.st_size))
+        return sorted(files)
+
+    async def start(self):
+        for _, video_id, size in await asyncio.to_thread(self._scan):
+            self._files[video_id] = size
+            self.size += size
+        await self._evict()
+
+    def __contains__(self, video_id):
+        return video_id in self._files
+
+    def path_for(self, video_id):
+        """Path of the cached file for `video_id` (counted as a hit), or None."""
+        if video_id not in self._files:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._files.move_to_end(video_id)
+        path = self._path(video_id)
+        try:
+            # mtime = masa terakhir dimainkan, untuk susunan LRU selepas restart
+            os.utime(path)
+        except OSError:
+            self._forget(video_id)
+            return None
+        return path
+
+    def record_play(self, video_id, audio_url):
+        """Count a streamed play; popular tracks are queued for transcoding."""
+        if not video_id or not audio_url or video_id in self._files or video_id in self._jobs:
+            return
+        if len(self._plays) >= 10000:
+            # Kiraan lagu yang jarang dimainkan tak perlu disimpan selamanya
+            self._plays.clear()
+        self._plays[video_id] += 1
+        if self._plays[video_id] >= self.min_plays:
+            del self._plays[video_id]
+            self._jobs[video_id] = asyncio.create_task(self._transcode(video_id, audio_url))
+
+    async def _transcode(self, video_id, audio_url):
+        path = self._path(video_id)
+        part = path + ".part"
+        try:
+            async with self._slots:
+                process = await asyncio.create_subprocess_exec(
+                    self.ffmpeg, "-nostdin", "-loglevel", "error", *self.before_options,
+                    "-i", audio_url, "-vn", "-c:a", "libopus", "-b:a", self.bitrate, "-f", "ogg", "-y", part,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE,
+                )
+                try:
+                    _, stderr = await process.communicate()
+                except asyncio.CancelledError:
+                    process.kill()
+                    raise
+                if process.returncode != 0:
+                    print(f"Audio cache transcode failed for {video_id}: {stderr.decode(errors='replace').strip()[:200]}")
+                    return
+            os.replace(part, path)
+            size = os.path.getsize(path)
+            self._files[video_id] = size
+            self.size += size
+            self.transcodes += 1
+            await self._evict()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Audio cache transcode failed for {video_id}: {e}")
+        finally:
+            self._jobs.pop(video_id, None)
+            if os.path.exists(part):
+                os.remove(part)
+
+    def _forget(self, video_id):
+        size = self._files.pop(video_id, None)
+        if size is not None:
+            self.size -= size
+
+    async def _evict(self):
+        # Pilih fail paling lama dahulu; saiz hanya ditolak selepas fail betul-betul
+        # dibuang (di Windows fail yang sedang dimainkan tak boleh dipadam)
+        victims = []
+        projected = self.size
+        for video_id, size in self._files.items():
+            if projected <= self.max_bytes or len(self._files) - len(victims) <= 1:
+                break
+            victims.append(video_id)
+            projected -= size
+        if victims:
+            removed = await asyncio.to_thread(self._remove_files, [(video_id, self._path(video_id)) for video_id in victims])
+            for video_id in removed:
+                self._forget(video_id)
+
+    @staticmethod
+    def _remove_files(files):
+        removed = []
+        for video_id, path in files:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # Kekal dalam senarai dan dikira; dicuba semula pada eviction seterusnya
+                print(f"Failed to remove cached audio {path}: {e}")
+                continue
+            removed.append(video_id)
+        return removed
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "files": len(self._files),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "transcodes": self.transcodes,
+            "pending": len(self._jobs),
+        }
+
+    async def close(self):
+        jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        await asyncio.gather(*jobs, return_exceptions=True)
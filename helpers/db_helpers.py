@@ -1,46 +1,247 @@
 import os
+import queue
 import sqlite3
+import asyncio
+import threading
+from concurrent.futures import Future
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WARNINGS_DB_PATH = os.path.join(BASE_DIR, "user_warnings.db")
+
+CREATE_USER_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS "user_per_guild" (
+        "user_id" INTEGER,
+        "warning_count" INTEGER,
+        "guild_id" INTEGER,
+        PRIMARY KEY("user_id","guild_id")
+    )
+"""
+
+# Satu statement atomik: insert 1 atau tambah 1, terus pulangkan nilai baru
+INCREMENT_WARNING_SQL = """
+    INSERT INTO user_per_guild (user_id, warning_count, guild_id)
+    VALUES (?, 1, ?)
+    ON CONFLICT(user_id, guild_id) DO UPDATE SET warning_count = warning_count + 1
+    RETURNING warning_count;
+"""
+
+# Tambah delta terkumpul (write-behind flush dari WarningCache)
+ADD_WARNINGS_SQL = """
+    INSERT INTO user_per_guild (user_id, warning_count, guild_id)
+    VALUES (?, ?, ?)
+    ON CONFLICT(user_id, guild_id) DO UPDATE SET warning_count = warning_count + excluded.warning_count;
+"""
 
 def create_user_table():
-    connection = sqlite3.connect(os.path.join(BASE_DIR, "user_warnings.db"))
+    connection = sqlite3.connect(WARNINGS_DB_PATH)
     cursor = connection.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS "user_per_guild" (
-            "user_id" INTEGER,
-            "warning_count" INTEGER,
-            "guild_id" INTEGER,
-            PRIMARY KEY("user_id","guild_id")
-        )
-    """)
+    cursor.execute(CREATE_USER_TABLE_SQL)
     connection.commit()
     connection.close()
 
 def increase_and_get_warnings(user_id: int, guild_id: int) -> int:
-    connection = sqlite3.connect(os.path.join(BASE_DIR, "user_warnings.db"))
-    cursor = connection.cursor()
-
-    cursor.execute("""
-        SELECT warning_count FROM user_per_guild
-        WHERE user_id = ? AND guild_id = ?;
-    """, (user_id, guild_id))
-    result = cursor.fetchone()
-
-    if result is None:
-        cursor.execute("""
-            INSERT INTO user_per_guild (user_id, warning_count, guild_id)
-            VALUES (?, 1, ?);
-        """, (user_id, guild_id))
-        connection.commit()
+    # Versi blocking, untuk skrip luar sahaja. Cog guna WarningStore.
+    connection = sqlite3.connect(WARNINGS_DB_PATH)
+    try:
+        with connection:
+            (count,) = connection.execute(INCREMENT_WARNING_SQL, (user_id, guild_id)).fetchone()
+        return count
+    finally:
         connection.close()
-        return 1
 
-    new_count = result[0] + 1
-    cursor.execute("""
-        UPDATE user_per_guild SET warning_count = ?
-        WHERE user_id = ? AND guild_id = ?;
-    """, (new_count, user_id, guild_id))
-    connection.commit()
-    connection.close()
-    return new_count
+
+class SQLiteWorker:
+    """One long-lived SQLite connection owned by a dedicated thread.
+
+    Jobs are callables taking the connection; they run one at a time on the
+    worker thread, so the event loop never blocks on disk I/O and writes
+    never race each other.
+    """
+
+    def __init__(self, path: str, name: str = "sqlite-worker"):
+        self.path = path
+        self._jobs = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL;")
+        connection.execute("PRAGMA synchronous=NORMAL;")
+        connection.execute("PRAGMA busy_timeout=5000;")
+        return connection
+
+    def _run(self):
+        connection = self._connect()
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                fn, future = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(connection))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            connection.close()
+
+    def submit(self, fn) -> Future:
+        if self._closed:
+            raise RuntimeError(f"SQLite worker for {self.path} is closed")
+        future = Future()
+        self._jobs.put((fn, future))
+        return future
+
+    async def run(self, fn):
+        """Run `fn(connection)` on the worker thread and await its result."""
+        return await asyncio.wrap_future(self.submit(fn))
+
+    def run_sync(self, fn):
+        """Blocking variant of `run`, for setup code outside the event loop."""
+        return self.submit(fn).result()
+
+    async def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._jobs.put(None)
+        await asyncio.to_thread(self._thread.join)
+
+
+class WarningStore:
+    """Async access to the `user_per_guild` warning counters."""
+
+    def __init__(self, path: str = WARNINGS_DB_PATH):
+        self._worker = SQLiteWorker(path, name="warning-store")
+        self._worker.run_sync(self._create_table)
+
+    @staticmethod
+    def _create_table(connection):
+        with connection:
+            connection.execute(CREATE_USER_TABLE_SQL)
+
+    async def increment(self, user_id: int, guild_id: int) -> int:
+        """Add one warning and return the new count."""
+        def job(connection):
+            with connection:
+                (count,) = connection.execute(INCREMENT_WARNING_SQL, (user_id, guild_id)).fetchone()
+            return count
+        return await self._worker.run(job)
+
+    async def increment_many(self, offenders) -> list:
+        """Add one warning per (user_id, guild_id) pair in a single transaction.
+
+        Returns the new counts in the same order; a pair listed twice gets
+        two warnings.
+        """
+        offenders = list(offenders)
+
+        def job(connection):
+            counts = []
+            with connection:
+                for user_id, guild_id in offenders:
+                    (count,) = connection.execute(INCREMENT_WARNING_SQL, (user_id, guild_id)).fetchone()
+                    counts.append(count)
+            return counts
+        return await self._worker.run(job)
+
+    async def add_many(self, deltas) -> None:
+        """Apply (user_id, guild_id, delta) increments in a single transaction."""
+        rows = [(user_id, delta, guild_id) for user_id, guild_id, delta in deltas]
+
+        def job(connection):
+            with connection:
+                connection.executemany(ADD_WARNINGS_SQL, rows)
+        await self._worker.run(job)
+
+    async def load_all(self) -> dict:
+        """Return every counter as {(user_id, guild_id): warning_count}."""
+        def job(connection):
+            rows = connection.execute("SELECT user_id, guild_id, warning_count FROM user_per_guild;")
+            return {(user_id, guild_id): count for user_id, guild_id, count in rows}
+        return await self._worker.run(job)
+
+    async def get(self, user_id: int, guild_id: int) -> int:
+        def job(connection):
+            row = connection.execute("""
+                SELECT warning_count FROM user_per_guild
+                WHERE user_id = ? AND guild_id = ?;
+            """, (user_id, guild_id)).fetchone()
+            return row[0] if row else 0
+        return await self._worker.run(job)
+
+    async def close(self):
+        await self._worker.close()
+
+
+class WarningCache:
+    """Write-behind cache in front of `WarningStore`.
+
+    All counters are loaded once by `start()`. After that `increment()` and
+    `get()` are plain dict operations; increments are coalesced per
+    (user, guild) and written in one transaction every `flush_interval`
+    seconds, or sooner once `flush_threshold` counters are dirty.
+    """
+
+    def __init__(self, store: WarningStore, flush_interval: float = 5.0, flush_threshold: int = 50):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._counts = {}   # (user_id, guild_id) -> jumlah warning terkini
+        self._dirty = {}    # (user_id, guild_id) -> delta yang belum ditulis
+        self._wake = asyncio.Event()
+        self._flush_task = None
+        self._closing = False
+
+    async def start(self):
+        self._counts = await self.store.load_all()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def get(self, user_id: int, guild_id: int) -> int:
+        return self._counts.get((user_id, guild_id), 0)
+
+    def increment(self, user_id: int, guild_id: int, amount: int = 1) -> int:
+        """Add warnings in memory and return the new count (no disk I/O)."""
+        key = (user_id, guild_id)
+        count = self._counts.get(key, 0) + amount
+        self._counts[key] = count
+        self._dirty[key] = self._dirty.get(key, 0) + amount
+        if len(self._dirty) >= self.flush_threshold:
+            self._wake.set()
+        return count
+
+    async def _flush_loop(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        pending, self._dirty = self._dirty, {}
+        try:
+            await self.store.add_many((user_id, guild_id, delta) for (user_id, guild_id), delta in pending.items())
+        except Exception as e:
+            print(f"Failed to flush {len(pending)} warning counters: {e}")
+            # Pulangkan semula supaya cuba lagi pada flush seterusnya
+            for key, delta in pending.items():
+                self._dirty[key] = self._dirty.get(key, 0) + delta
+
+    async def close(self):
+        # Jangan cancel di tengah flush, nanti delta yang sedang ditulis hilang
+        self._closing = True
+        self._wake.set()
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        await self.flush()
+        await self.store.close()
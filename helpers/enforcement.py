@@ -0,0 +1,83 @@
+# helpers/enforcement.py
+#
+# Queue tindakan moderation (delete, warning, ban) per guild.
+# on_message hanya kesan dan masukkan ke queue; worker kumpul semua kesalahan
+# dalam satu tetingkap masa dan serahkan sekali gus kepada handler, supaya
+# banyak mesej boleh dipadam dengan satu bulk delete.
+
+import asyncio
+
+
+class Offense:
+    """One flagged message waiting for enforcement."""
+
+    __slots__ = ("message", "warnings", "reason")
+
+    def __init__(self, message, warnings: int, reason: str):
+        self.message = message
+        self.warnings = warnings
+        self.reason = reason
+
+
+class EnforcementQueue:
+    """Bounded per-guild queues, each drained in batches by its own worker.
+
+    `handler(guild_id, offenses)` is awaited with everything that arrived
+    within `window` seconds of the first queued offense. Workers exit when
+    their queue runs dry and are recreated on the next `submit`.
+    """
+
+    def __init__(self, handler, maxsize: int = 500, window: float = 1.0):
+        self.handler = handler
+        self.maxsize = maxsize
+        self.window = window
+        self._queues = {}
+        self._workers = {}
+
+    def submit(self, guild_id: int, offense: Offense) -> bool:
+        """Queue an offense without waiting. Returns False if the guild's queue is full."""
+        queue = self._queues.get(guild_id)
+        if queue is None:
+            queue = self._queues[guild_id] = asyncio.Queue(maxsize=self.maxsize)
+        try:
+            queue.put_nowait(offense)
+        except asyncio.QueueFull:
+            return False
+
+        worker = self._workers.get(guild_id)
+        if worker is None or worker.done():
+            self._workers[guild_id] = asyncio.create_task(self._worker(guild_id, queue))
+        return True
+
+    def _drain(self, queue):
+        batch = []
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+
+    async def _worker(self, guild_id: int, queue: asyncio.Queue):
+        while not queue.empty():
+            # Tunggu sekejap supaya mesej yang datang serentak masuk satu batch
+            await asyncio.sleep(self.window)
+            batch = self._drain(queue)
+            try:
+                await self.handler(guild_id, batch)
+            except Exception as e:
+                print(f"Error enforcing {len(batch)} offenses in guild {guild_id}: {e}")
+
+    async def close(self):
+        """Let running batches finish, then enforce whatever is still queued."""
+        workers = [worker for worker in self._workers.values() if not worker.done()]
+        self._workers.clear()
+        if workers:
+            _, pending = await asyncio.wait(workers, timeout=self.window + 10)
+            for worker in pending:
+                worker.cancel()
+
+        for guild_id, queue in self._queues.items():
+            batch = self._drain(queue)
+            if batch:
+                try:
+                    await self.handler(guild_id, batch)
+                except Exception as e:
+                    print(f"Error enforcing {len(batch)} offenses in guild {guild_id}: {e}")
@@ -0,0 +1,77 @@
+# helpers/extractor.py
+#
+# Servis extraction yt-dlp untuk muzik. Ada thread pool sendiri (tak kongsi
+# default executor dengan kod lain seperti pip updater), satu YoutubeDL per
+# thread per set option yang diguna semula, had extraction serentak per
+# guild, dan query sama yang diminta serentak hanya diextract sekali.
+
+import json
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import yt_dlp
+
+
+def options_key(options) -> str:
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+class Extractor:
+    """Bounded, deduplicating yt-dlp `extract_info` runner.
+
+    Results of deduplicated calls are the same dict object for every
+    caller, so callers must treat them as read-only.
+    """
+
+    def __init__(self, max_workers: int = 3, per_guild_limit: int = 2):
+        self.per_guild_limit = per_guild_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ytdlp")
+        self._local = threading.local()
+        # (query, options_key) -> asyncio.Future yang sedang berjalan
+        self._inflight = {}
+        self._guild_slots = {}
+
+    def _ydl(self, options, key):
+        # YoutubeDL tak thread-safe, jadi setiap thread ada instance sendiri
+        instances = getattr(self._local, "instances", None)
+        if instances is None:
+            instances = self._local.instances = {}
+        ydl = instances.get(key)
+        if ydl is None:
+            ydl = instances[key] = yt_dlp.YoutubeDL(dict(options))
+        return ydl
+
+    def _extract(self, query, options, key):
+        return self._ydl(options, key).extract_info(query, download=False)
+
+    async def extract(self, query: str, options: dict, guild_id=None):
+        """Extract `query` (no download), waiting for a slot if `guild_id` is at its cap."""
+        key = options_key(options)
+        inflight_key = (query, key)
+        # Query sama yang sedang berjalan: tumpang, tak perlu slot guild
+        future = self._inflight.get(inflight_key)
+        if future is not None:
+            return await asyncio.shield(future)
+        if guild_id is None:
+            return await self._shared(inflight_key, query, options, key)
+        # Guild id boleh int (interaction) atau str (kunci queue); satu semaphore per guild
+        guild_id = str(guild_id)
+        slots = self._guild_slots.get(guild_id)
+        if slots is None:
+            slots = self._guild_slots[guild_id] = asyncio.Semaphore(self.per_guild_limit)
+        async with slots:
+            return await self._shared(inflight_key, query, options, key)
+
+    async def _shared(self, inflight_key, query, options, key):
+        future = self._inflight.get(inflight_key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, self._extract, query, options, key)
+            self._inflight[inflight_key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(inflight_key, None))
+        # shield: seorang pemanggil dibatalkan tak batalkan yang lain
+        return await asyncio.shield(future)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
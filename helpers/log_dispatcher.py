@@ -0,0 +1,125 @@
+# helpers/log_dispatcher.py
+#
+# Kumpul embed action log per channel untuk tempoh singkat, kemudian hantar
+# sampai 10 embed dalam satu mesej. 200 perubahan role jadi ~20 send, bukan
+# 200, jadi tak kena rate limit.
+
+import asyncio
+
+import discord
+
+MAX_EMBEDS_PER_MESSAGE = 10
+# Had Discord: jumlah aksara semua embed dalam satu mesej
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+# Had Discord bagi description dan nilai field satu embed
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_FIELD_VALUE_LIMIT = 1024
+
+
+def clip(text: str, limit: int) -> str:
+    """`text` cut to at most `limit` characters, marked with an ellipsis when cut."""
+    text = str(text)
+    if len(text) <= limit:
+        return text
+    return text[:limit - 1] + "…"
+
+
+async def channel_send(channel, embeds):
+    await channel.send(embeds=embeds)
+
+
+class _ChannelBuffer:
+    __slots__ = ("channel", "items", "keys", "timer", "lock")
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.items = []
+        # key -> index dalam items, untuk gabung entri berkaitan
+        self.keys = {}
+        self.timer = None
+        self.lock = asyncio.Lock()
+
+
+class LogDispatcher:
+    """Buffers action-log embeds per channel and sends them in batches.
+
+    Items are `discord.Embed`s, or objects with `to_embed()` and `merge(other)`
+    when submitted with a `key`: a second item with the same key while the
+    first is still buffered is merged into it instead of queued. `submit`
+    waits for a flush when a channel already holds `max_buffer` items.
+    """
+
+    def __init__(self, send=channel_send, flush_latency: float = 2.0, max_buffer: int = 100):
+        self.send = send
+        self.flush_latency = flush_latency
+        self.max_buffer = max_buffer
+        self._buffers = {}
+
+    async def submit(self, channel, item, key=None):
+        buffer = self._buffers.get(channel.id)
+        if buffer is None:
+            buffer = self._buffers[channel.id] = _ChannelBuffer(channel)
+
+        if key is not None and key in buffer.keys:
+            buffer.items[buffer.keys[key]].merge(item)
+            return
+
+        if len(buffer.items) >= self.max_buffer:
+            # Backpressure: pemanggil tunggu sehingga buffer dihantar
+            await self.flush(channel.id)
+
+        if key is not None:
+            buffer.keys[key] = len(buffer.items)
+        buffer.items.append(item)
+
+        if buffer.timer is None or buffer.timer.done():
+            buffer.timer = asyncio.create_task(self._flush_later(channel.id))
+
+    async def _flush_later(self, channel_id):
+        await asyncio.sleep(self.flush_latency)
+        await self.flush(channel_id)
+
+    async def flush(self, channel_id):
+        buffer = self._buffers.get(channel_id)
+        if buffer is None:
+            return
+        async with buffer.lock:
+            items, buffer.items, buffer.keys = buffer.items, [], {}
+            if not items:
+                return
+            embeds = [item.to_embed() if hasattr(item, "to_embed") else item for item in items]
+            for chunk in self._chunks(embeds):
+                try:
+                    await self.send(buffer.channel, chunk)
+                except discord.HTTPException as e:
+                    if len(chunk) == 1:
+                        print(f"Failed to send action log embed to #{buffer.channel}: {e}")
+                        continue
+                    # Satu embed tak sah gagalkan seluruh mesej; hantar satu-satu
+                    # supaya hanya embed itu yang hilang
+                    for embed in chunk:
+                        try:
+                            await self.send(buffer.channel, [embed])
+                        except Exception as e:
+                            print(f"Failed to send action log embed to #{buffer.channel}: {e}")
+                except Exception as e:
+                    print(f"Failed to send {len(chunk)} action log embeds to #{buffer.channel}: {e}")
+
+    def _chunks(self, embeds):
+        chunk = []
+        size = 0
+        for embed in embeds:
+            embed_size = len(embed)
+            if chunk and (len(chunk) == MAX_EMBEDS_PER_MESSAGE or size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE):
+                yield chunk
+                chunk = []
+                size = 0
+            chunk.append(embed)
+            size += embed_size
+        if chunk:
+            yield chunk
+
+    async def close(self):
+        # Timer yang masih berjalan akan jumpa buffer kosong, tak perlu cancel
+        for channel_id in list(self._buffers):
+            await self.flush(channel_id)
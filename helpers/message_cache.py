@@ -0,0 +1,96 @@
+# helpers/message_cache.py
+#
+# Cache kandungan mesej yang kecil untuk action log. Cache discord.py simpan
+# objek Message penuh dan hanya 1000 mesej; di sini kita simpan yang perlu
+# sahaja (author, channel, content, URL attachment) dalam rekod __slots__,
+# dengan LRU dan had saiz dalam bait.
+
+import sys
+from collections import OrderedDict
+
+# Anggaran overhead satu rekod + entri dict, selain teks
+_RECORD_OVERHEAD = 240
+
+
+class CachedMessage:
+    __slots__ = ("id", "guild_id", "channel_id", "author_id", "author_bot", "content", "attachments", "size")
+
+    def __init__(self, id, guild_id, channel_id, author_id, author_bot, content, attachments):
+        self.id = id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.author_bot = author_bot
+        self.content = content
+        # tuple (url, content_type)
+        self.attachments = attachments
+        self.size = _RECORD_OVERHEAD + sys.getsizeof(content) + sum(
+            sys.getsizeof(url) + 16 for url, _ in attachments
+        )
+
+    @classmethod
+    def from_message(cls, message):
+        """Keep only the parts of a `discord.Message` the action log needs."""
+        return cls(
+            message.id,
+            message.guild.id if message.guild else None,
+            message.channel.id,
+            message.author.id,
+            message.author.bot,
+            message.content,
+            tuple((att.url, att.content_type) for att in message.attachments),
+        )
+
+    @property
+    def image_urls(self):
+        return [url for url, content_type in self.attachments if content_type and content_type.startswith("image")]
+
+
+class MessageCache:
+    """LRU cache of `CachedMessage` records bounded by an approximate byte budget."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._records = OrderedDict()
+
+    def __len__(self):
+        return len(self._records)
+
+    def add(self, message) -> CachedMessage:
+        record = CachedMessage.from_message(message)
+        self._put(record)
+        return record
+
+    def _put(self, record: CachedMessage):
+        old = self._records.pop(record.id, None)
+        if old is not None:
+            self.size -= old.size
+        self._records[record.id] = record
+        self.size += record.size
+        while self.size > self.max_bytes and self._records:
+            _, evicted = self._records.popitem(last=False)
+            self.size -= evicted.size
+
+    def get(self, message_id: int):
+        record = self._records.get(message_id)
+        if record is not None:
+            self._records.move_to_end(message_id)
+        return record
+
+    def pop(self, message_id: int):
+        record = self._records.pop(message_id, None)
+        if record is not None:
+            self.size -= record.size
+        return record
+
+    def update_content(self, message_id: int, content: str):
+        """Replace the stored content after an edit; returns the previous record or None."""
+        record = self._records.get(message_id)
+        if record is None:
+            return None
+        self._put(CachedMessage(
+            record.id, record.guild_id, record.channel_id, record.author_id, record.author_bot,
+            content, record.attachments
+        ))
+        return record
@@ -0,0 +1,200 @@
+# helpers/music_queue.py
+#
+# Struktur queue muzik. Setiap lagu ialah objek Track (__slots__), bukan
+# tuple yang dibuka ikut kedudukan. SongQueue simpan lagu dalam deque
+# (append/pop O(1)) bersama kiraan per user dan per video, supaya semakan
+# quota, duplicate dan jumlah masa tak perlu lalu seluruh queue. Paparan
+# ambil satu muka surat sahaja melalui indeks.
+
+import random
+import datetime
+from collections import deque, Counter
+
+
+def format_duration(seconds) -> str:
+    seconds = int(seconds or 0)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class Track:
+    __slots__ = ("audio_url", "title", "video_id", "duration", "requester_id")
+
+    def __init__(self, audio_url, title, video_id, duration, requester_id):
+        # audio_url boleh None: stream URL diambil bila lagu hampir dimainkan
+        self.audio_url = audio_url
+        self.title = title
+        self.video_id = video_id
+        self.duration = int(duration or 0)
+        self.requester_id = requester_id
+
+    @property
+    def requester(self):
+        return f"<@{self.requester_id}>"
+
+    @property
+    def thumbnail(self):
+        return f"https://img.youtube.com/vi/{self.video_id}/hqdefault.jpg" if self.video_id else None
+
+    def to_dict(self):
+        # Stream URL tak disimpan: tamat tempoh, diambil semula bila dimainkan
+        return {"title": self.title, "video_id": self.video_id, "duration": self.duration, "requester_id": self.requester_id}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(None, data["title"], data["video_id"], data["duration"], data["requester_id"])
+
+
+class NowPlaying:
+    """The track a guild is playing plus the ids needed to restore its controls."""
+
+    __slots__ = ("track", "start_time", "message_id", "channel_id", "voice_channel_id", "paused_at", "paused_total")
+
+    def __init__(self, track, start_time, message_id, channel_id, voice_channel_id):
+        self.track = track
+        self.start_time = start_time
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.voice_channel_id = voice_channel_id
+        self.paused_at = None
+        # Jumlah saat dijeda, supaya progress bar tak bergerak semasa pause
+        self.paused_total = 0.0
+
+    @property
+    def paused(self):
+        return self.paused_at is not None
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def resume(self):
+        if self.paused_at is not None:
+            self.paused_total += (datetime.datetime.now(datetime.timezone.utc) - self.paused_at).total_seconds()
+            self.paused_at = None
+
+    @property
+    def elapsed(self):
+        now = self.paused_at or datetime.datetime.now(datetime.timezone.utc)
+        elapsed = (now - self.start_time).total_seconds() - self.paused_total
+        return min(elapsed, self.track.duration) if self.track.duration else elapsed
+
+
+class SongQueue:
+    """Per-guild track queue with size cap, per-user quota and duplicate check.
+
+    `per_user_limit` of 0 means no quota. Positions passed to `remove` and
+    `move` are 0-based.
+    """
+
+    def __init__(self, max_size: int = 500, per_user_limit: int = 0, allow_duplicates: bool = False):
+        self.max_size = max_size
+        self.per_user_limit = per_user_limit
+        self.allow_duplicates = allow_duplicates
+        self.total_duration = 0
+        self._tracks = deque()
+        self._per_user = Counter()
+        self._video_ids = Counter()
+
+    def __len__(self):
+        return len(self._tracks)
+
+    def __iter__(self):
+        return iter(self._tracks)
+
+    def __getitem__(self, index):
+        return self._tracks[index]
+
+    def count_for(self, user_id) -> int:
+        return self._per_user[user_id]
+
+    def check_room(self, user_id):
+        """Reason `user_id` cannot queue another track (size cap or quota), or None."""
+        if len(self._tracks) >= self.max_size:
+            return f"The queue is limited to {self.max_size} songs."
+        if self.per_user_limit and self._per_user[user_id] >= self.per_user_limit:
+            return f"You already have {self.per_user_limit} songs in the queue."
+        return None
+
+    def check(self, track):
+        """Reason `track` cannot be queued, or None if it can."""
+        reason = self.check_room(track.requester_id)
+        if reason:
+            return reason
+        if not self.allow_duplicates and track.video_id and self._video_ids[track.video_id]:
+            return f"**{track.title}** is already in the queue."
+        return None
+
+    def add(self, track):
+        """Append `track`; returns the rejection reason instead if it cannot be queued."""
+        reason = self.check(track)
+        if reason is None:
+            self._tracks.append(track)
+            self._added(track)
+        return reason
+
+    def restore(self, track):
+        # Tanpa semakan had: sesi yang disambung semula mesti sama seperti disimpan
+        self._tracks.append(track)
+        self._added(track)
+
+    def add_front(self, track):
+        # Tanpa semakan had: untuk lagu yang dikembalikan ke depan queue
+        self._tracks.appendleft(track)
+        self._added(track)
+
+    def popleft(self):
+        track = self._tracks.popleft()
+        self._removed(track)
+        return track
+
+    def remove(self, index: int):
+        track = self._tracks[index]
+        del self._tracks[index]
+        self._removed(track)
+        return track
+
+    def move(self, source: int, destination: int):
+        track = self._tracks[source]
+        del self._tracks[source]
+        self._tracks.insert(destination, track)
+        return track
+
+    def shuffle(self, rng=random):
+        tracks = list(self._tracks)
+        rng.shuffle(tracks)
+        self._tracks = deque(tracks)
+
+    def clear(self):
+        self._tracks.clear()
+        self._per_user.clear()
+        self._video_ids.clear()
+        self.total_duration = 0
+
+    def page_count(self, per_page: int) -> int:
+        return max(1, -(-len(self._tracks) // per_page))
+
+    def page(self, page: int, per_page: int):
+        """[(1-based position, Track)] for a 1-based page, read by index only."""
+        start = (page - 1) * per_page
+        stop = min(start + per_page, len(self._tracks))
+        return [(index + 1, self._tracks[index]) for index in range(start, stop)]
+
+    def _added(self, track):
+        self._per_user[track.requester_id] += 1
+        if track.video_id:
+            self._video_ids[track.video_id] += 1
+        self.total_duration += track.duration
+
+    def _removed(self, track):
+        self._per_user[track.requester_id] -= 1
+        if not self._per_user[track.requester_id]:
+            del self._per_user[track.requester_id]
+        if track.video_id:
+            self._video_ids[track.video_id] -= 1
+            if not self._video_ids[track.video_id]:
+                del self._video_ids[track.video_id]
+        self.total_duration -= track.duration
@@ -0,0 +1,129 @@
+# helpers/music_sessions.py
+#
+# Simpan sesi muzik setiap guild (lagu semasa + kedudukan, queue, channel)
+# ke SQLite supaya boleh disambung selepas bot crash atau restart.
+# Perubahan digabung (debounce) sebelum ditulis, dan kedudukan lagu yang
+# sedang dimainkan disimpan semula secara berkala (checkpoint).
+
+import os
+import json
+import time
+import asyncio
+
+from helpers.db_helpers import SQLiteWorker
+
+DATA_FOLDER = "data"
+SESSIONS_DB_PATH = os.path.join(DATA_FOLDER, "music_sessions.db")
+
+CREATE_SESSIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS sessions (
+        guild_id TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )
+"""
+
+UPSERT_SESSION_SQL = """
+    INSERT INTO sessions (guild_id, data, updated_at) VALUES (?, ?, ?)
+    ON CONFLICT(guild_id) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at;
+"""
+
+
+class SessionStore:
+    """Debounced per-guild snapshots of music sessions.
+
+    `snapshot(guild_id)` returns a JSON-serialisable dict, or None when the
+    guild has nothing to resume (its row is then deleted). Dirty guilds are
+    written `debounce` seconds after the first change; guilds with a saved
+    session are re-snapshotted every `checkpoint` seconds so the stored
+    position stays recent.
+    """
+
+    def __init__(self, snapshot, path: str = SESSIONS_DB_PATH, debounce: float = 2.0, checkpoint: float = 15.0):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.snapshot = snapshot
+        self.debounce = debounce
+        self.checkpoint = checkpoint
+        self.writes = 0
+        self._dirty = set()
+        self._active = set()
+        self._wake = asyncio.Event()
+        self._flush_task = None
+        self._closing = False
+        self._worker = SQLiteWorker(path, name="music-sessions")
+        self._worker.run_sync(self._create_table)
+
+    @staticmethod
+    def _create_table(connection):
+        with connection:
+            connection.execute(CREATE_SESSIONS_SQL)
+
+    async def load_all(self) -> dict:
+        """Every saved session as {guild_id: data}."""
+        def job(connection):
+            return connection.execute("SELECT guild_id, data FROM sessions;").fetchall()
+        sessions = {}
+        for guild_id, data in await self._worker.run(job):
+            try:
+                sessions[guild_id] = json.loads(data)
+            except ValueError as e:
+                print(f"Ignoring unreadable music session for guild {guild_id}: {e}")
+        return sessions
+
+    def start(self):
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def mark_dirty(self, guild_id):
+        self._dirty.add(guild_id)
+        self._wake.set()
+
+    async def _flush_loop(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.checkpoint)
+                # Gabungkan perubahan berturut-turut jadi satu tulis
+                await asyncio.sleep(self.debounce)
+            except asyncio.TimeoutError:
+                self._dirty.update(self._active)
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        pending, self._dirty = self._dirty, set()
+        now = time.time()
+        rows, deleted = [], []
+        for guild_id in pending:
+            data = self.snapshot(guild_id)
+            if data is None:
+                deleted.append((guild_id,))
+                self._active.discard(guild_id)
+            else:
+                rows.append((guild_id, json.dumps(data), now))
+                self._active.add(guild_id)
+
+        def job(connection):
+            with connection:
+                connection.executemany(UPSERT_SESSION_SQL, rows)
+                connection.executemany("DELETE FROM sessions WHERE guild_id = ?;", deleted)
+        try:
+            await self._worker.run(job)
+            self.writes += 1
+        except Exception as e:
+            print(f"Failed to save {len(pending)} music sessions: {e}")
+            self._dirty.update(pending)
+
+    async def close(self):
+        # Simpan keadaan terakhir (termasuk kedudukan lagu) sebelum tutup
+        self._closing = True
+        self._wake.set()
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+        self._dirty.update(self._active)
+        await self.flush()
+        await self._worker.close()
@@ -0,0 +1,97 @@
+# helpers/panel_updater.py
+#
+# Kemas kini satu mesej "panel" per guild (contoh: now playing + queue).
+# Setiap guild ada satu task yang render semula pada kadar tetap, atau tak
+# lama selepas ada perubahan. Perubahan yang berlaku serentak digabung jadi
+# satu edit, dan edit dilangkau jika embed tak berubah.
+
+import asyncio
+import discord
+
+
+class _Panel:
+    __slots__ = ("message", "last", "dirty", "task")
+
+    def __init__(self, message, last):
+        self.message = message
+        self.last = last
+        self.dirty = asyncio.Event()
+        self.task = None
+
+
+class PanelUpdater:
+    """Keeps one message per guild in sync with `render(guild_id)`.
+
+    `render` returns a `discord.Embed`, or None when the panel should stop
+    updating. Edits happen every `interval` seconds at most, plus once
+    `coalesce` seconds after `mark_dirty`.
+    """
+
+    def __init__(self, render, interval: float = 10.0, coalesce: float = 1.0):
+        self.render = render
+        self.interval = interval
+        self.coalesce = coalesce
+        self.edits = 0
+        self.skipped = 0
+        self._panels = {}
+
+    def attach(self, guild_id, message, embed=None):
+        """Make `message` the guild's panel; `embed` is what it currently shows."""
+        self.detach(guild_id)
+        panel = self._panels[guild_id] = _Panel(message, embed.to_dict() if embed else None)
+        panel.task = asyncio.create_task(self._run(guild_id, panel))
+
+    def message_for(self, guild_id):
+        panel = self._panels.get(guild_id)
+        return panel.message if panel else None
+
+    def mark_rendered(self, guild_id, embed):
+        """Record that the panel was edited elsewhere (e.g. by an interaction response)."""
+        panel = self._panels.get(guild_id)
+        if panel is not None:
+            panel.last = embed.to_dict()
+
+    def mark_dirty(self, guild_id):
+        panel = self._panels.get(guild_id)
+        if panel is not None:
+            panel.dirty.set()
+
+    def detach(self, guild_id):
+        panel = self._panels.pop(guild_id, None)
+        if panel is not None and panel.task is not None:
+            panel.task.cancel()
+
+    async def _run(self, guild_id, panel):
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(panel.dirty.wait(), timeout=self.interval)
+                    # Tunggu sekejap supaya perubahan berturut-turut jadi satu edit
+                    await asyncio.sleep(self.coalesce)
+                except asyncio.TimeoutError:
+                    pass
+                panel.dirty.clear()
+
+                embed = self.render(guild_id)
+                if embed is None:
+                    break
+                data = embed.to_dict()
+                if data == panel.last:
+                    self.skipped += 1
+                    continue
+                try:
+                    await panel.message.edit(embed=embed)
+                except discord.NotFound:
+                    break
+                except discord.HTTPException as e:
+                    print(f"Failed to update panel for guild {guild_id}: {e}")
+                    continue
+                panel.last = data
+                self.edits += 1
+        finally:
+            if self._panels.get(guild_id) is panel:
+                del self._panels[guild_id]
+
+    def close(self):
+        for guild_id in list(self._panels):
+            self.detach(guild_id)
@@ -0,0 +1,66 @@
+# helpers/player.py
+#
+# Satu "player" per guild: task asyncio dengan inbox event. Semua keputusan
+# (lagu seterusnya, skip, stop, reconnect) dibuat satu demi satu dalam task
+# ini, jadi tiada race antara skip/stop dan lagu yang sedang bermula.
+# Callback `after` dari thread audio hanya hantar event "ended" tanpa
+# menunggu, supaya thread audio tak pernah tersekat pada panggilan REST.
+
+import asyncio
+
+
+class GuildPlayer:
+    """Serializes a guild's player events through `handler(player, event, *args)`.
+
+    `generation` is bumped for every track started (and on stop), so an
+    "ended" event from an older track can be recognised and ignored.
+    """
+
+    def __init__(self, guild_id, handler):
+        self.guild_id = guild_id
+        self.handler = handler
+        self.generation = 0
+        self.loop = asyncio.get_running_loop()
+        self._inbox = asyncio.Queue()
+        self._task = self.loop.create_task(self._run())
+
+    def next_generation(self) -> int:
+        self.generation += 1
+        return self.generation
+
+    def post(self, event, *args):
+        """Queue an event without waiting; safe to call from any thread."""
+        try:
+            self.loop.call_soon_threadsafe(self._inbox.put_nowait, (event, args, None))
+        except RuntimeError:
+            # Event loop sudah ditutup (bot sedang shutdown)
+            pass
+
+    async def send(self, event, *args):
+        """Queue an event from the event loop and wait for the handler's result.
+
+        Must not be awaited from inside the handler itself.
+        """
+        future = self.loop.create_future()
+        self._inbox.put_nowait((event, args, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            event, args, future = await self._inbox.get()
+            try:
+                result = await self.handler(self, event, *args)
+            except Exception as e:
+                print(f"Player error in guild {self.guild_id} ({event}): {e}")
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            else:
+                if future is not None and not future.done():
+                    future.set_result(result)
+
+    def close(self):
+        self._task.cancel()
+        while not self._inbox.empty():
+            _, _, future = self._inbox.get_nowait()
+            if future is not None and not future.done():
+                future.cancel()
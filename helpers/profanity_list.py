@@ -0,0 +1,168 @@
+# helpers/profanity_list.py
+#
+# Senarai perkataan lucah yang boleh di-reload tanpa restart bot:
+# senarai asas dari data/profanity.json + tambahan/buangan per guild.
+# Matcher dibina di thread lain dan ditukar sekali gus (satu assignment),
+# jadi on_message tak pernah tunggu atau nampak automaton separuh siap.
+
+import os
+import json
+import asyncio
+
+from helpers.profanity_matcher import ProfanityMatcher
+from helpers.text_normalizer import normalize
+
+DEFAULT_WORDS = ["default", "bad", "words"]
+
+
+def _clean(word: str) -> str:
+    return " ".join(word.lower().split())
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    # Tulis ke fail sementara dulu, kemudian replace supaya fail tak rosak
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class ProfanityFilter:
+    """Per-guild profanity matchers over a hot-reloadable word list."""
+
+    def __init__(self, path: str, overrides_path: str):
+        self.path = path
+        self.overrides_path = overrides_path
+        self.base_words = frozenset()
+        # guild_id (str) -> {"add": [...], "remove": [...]}
+        self.overrides = {}
+        self._mtime = None
+        self._base_matcher = None
+        # guild_id (str) -> (frozenset perkataan, matcher), hanya guild yang berbeza dari asas
+        self._guild_matchers = {}
+        self._rebuild_lock = asyncio.Lock()
+
+    def search(self, guild_id: int, text: str):
+        """Same as `ProfanityMatcher.search`, using the guild's effective list."""
+        entry = self._guild_matchers.get(str(guild_id))
+        matcher = entry[1] if entry is not None else self._base_matcher
+        if matcher is None:
+            return None
+        return matcher.search(text)
+
+    def words_for(self, guild_id) -> frozenset:
+        override = self.overrides.get(str(guild_id))
+        if not override:
+            return self.base_words
+        return (self.base_words | set(override.get("add", []))) - set(override.get("remove", []))
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def file_changed(self) -> bool:
+        return self._file_mtime() != self._mtime
+
+    def _load_files(self):
+        mtime = self._file_mtime()
+        if mtime is None:
+            print(f"⚠️ '{self.path}' not found. Using default words.")
+            words = DEFAULT_WORDS
+        else:
+            words = _read_json(self.path, DEFAULT_WORDS)
+        overrides = _read_json(self.overrides_path, {})
+        return mtime, frozenset(_clean(w) for w in words if _clean(w)), overrides
+
+    async def reload(self):
+        """Re-read the word list and overrides, then rebuild every matcher."""
+        async with self._rebuild_lock:
+            mtime, base_words, overrides = await asyncio.to_thread(self._load_files)
+            base_changed = base_words != self.base_words or self._base_matcher is None
+            self.base_words = base_words
+            self.overrides = overrides
+            self._mtime = mtime
+
+            # Matcher dikongsi antara guild yang senarainya sama
+            built = {}
+            if base_changed:
+                built[base_words] = await asyncio.to_thread(ProfanityMatcher, base_words, normalize)
+            else:
+                built[base_words] = self._base_matcher
+
+            # Guild yang senarainya tak berubah guna semula matcher lama
+            guild_matchers = {}
+            for guild_id in overrides:
+                words = self.words_for(guild_id)
+                if words == base_words:
+                    continue
+                if words not in built:
+                    previous = self._guild_matchers.get(guild_id)
+                    if previous is not None and previous[0] == words:
+                        built[words] = previous[1]
+                    else:
+                        built[words] = await asyncio.to_thread(ProfanityMatcher, words, normalize)
+                guild_matchers[guild_id] = (words, built[words])
+
+            self._base_matcher = built[base_words]
+            self._guild_matchers = guild_matchers
+            return len(base_words)
+
+    async def _rebuild_guild(self, guild_id: str):
+        words = self.words_for(guild_id)
+        guild_matchers = dict(self._guild_matchers)
+        if words == self.base_words:
+            guild_matchers.pop(guild_id, None)
+        else:
+            matcher = await asyncio.to_thread(ProfanityMatcher, words, normalize)
+            guild_matchers[guild_id] = (words, matcher)
+        self._guild_matchers = guild_matchers
+
+    async def _update_override(self, guild_id, word: str, add: bool) -> bool:
+        word = _clean(word)
+        if not word:
+            return False
+        async with self._rebuild_lock:
+            guild_id = str(guild_id)
+            if (word in self.words_for(guild_id)) == add:
+                return False
+            # Ubah salinan; self.overrides hanya diganti selepas fail berjaya ditulis,
+            # supaya memori dan fail tak berbeza jika penulisan gagal
+            overrides = {
+                gid: {"add": list(entry.get("add", [])), "remove": list(entry.get("remove", []))}
+                for gid, entry in self.overrides.items()
+            }
+            override = overrides.setdefault(guild_id, {"add": [], "remove": []})
+            added, removed = override["add"], override["remove"]
+            if add:
+                if word in removed:
+                    removed.remove(word)
+                else:
+                    added.append(word)
+            else:
+                if word in added:
+                    added.remove(word)
+                else:
+                    removed.append(word)
+            if not added and not removed:
+                del overrides[guild_id]
+            await asyncio.to_thread(_write_json, self.overrides_path, overrides)
+            self.overrides = overrides
+            await self._rebuild_guild(guild_id)
+            return True
+
+    async def add_word(self, guild_id, word: str) -> bool:
+        """Add `word` for one guild. Returns False if it is already filtered."""
+        return await self._update_override(guild_id, word, add=True)
+
+    async def remove_word(self, guild_id, word: str) -> bool:
+        """Stop filtering `word` in one guild. Returns False if it was not filtered."""
+        return await self._update_override(guild_id, word, add=False)
@@ -0,0 +1,221 @@
+# helpers/profanity_matcher.py
+#
+# Aho-Corasick matcher untuk senarai perkataan lucah.
+# Satu regex besar `\b(word1|word2|...)\b` cuba setiap alternatif pada setiap
+# posisi, jadi kosnya naik dengan saiz senarai. Automaton ini baca mesej sekali
+# sahaja, tak kira berapa banyak perkataan dalam senarai.
+
+from bisect import bisect_left
+
+
+def _is_word_char(ch: str) -> bool:
+    # Sama macam `\w` dalam regex Python (huruf, nombor, underscore)
+    return ch.isalnum() or ch == "_"
+
+
+def _fold(ch: str) -> str:
+    lowered = ch.lower()
+    # Sesetengah huruf jadi 2 aksara bila lower() (contoh "İ"), kekalkan
+    # satu aksara supaya index mesej asal tak lari.
+    return lowered if len(lowered) == 1 else ch
+
+
+def _normalize_term(term: str) -> str:
+    # Huruf kecil + whitespace berturut-turut jadi satu space ("son  of a bitch")
+    return " ".join("".join(_fold(ch) for ch in term).split())
+
+
+class ProfanityMatch:
+    """Result of `ProfanityMatcher.search`, shaped like `re.Match`."""
+
+    __slots__ = ("string", "term", "_start", "_end")
+
+    def __init__(self, string: str, term: str, start: int, end: int):
+        self.string = string
+        self.term = term
+        self._start = start
+        self._end = end
+
+    def group(self, index: int = 0) -> str:
+        if index not in (0, 1):
+            raise IndexError("no such group")
+        return self.string[self._start:self._end]
+
+    def start(self) -> int:
+        return self._start
+
+    def end(self) -> int:
+        return self._end
+
+    def span(self) -> tuple:
+        return self._start, self._end
+
+    def __repr__(self):
+        return f"<ProfanityMatch span={self.span()} match={self.group()!r}>"
+
+
+class ProfanityMatcher:
+    """Drop-in replacement for the compiled `\\b(...)\\b` profanity regex.
+
+    Matching is case-insensitive, respects word boundaries on both ends and
+    treats any run of whitespace in the message as a single space, so
+    multi-word phrases like "son of a bitch" still match across extra spaces.
+
+    If `normalizer` is given (see `helpers.text_normalizer.normalize`), both
+    the terms and every scanned message go through it first, and match spans
+    are mapped back onto the original message.
+    """
+
+    def __init__(self, terms, normalizer=None):
+        self._normalizer = normalizer
+        # State 0 ialah root. goto[state] = {char: next_state}
+        self._goto = [{}]
+        self._fail = [0]
+        # out[state] = tuple panjang perkataan yang tamat di state ini
+        self._out = [()]
+        self._terms = {}
+        self.max_length = 0
+
+        for term in terms:
+            if normalizer is not None:
+                term = normalizer(term).text
+            normalized = _normalize_term(term)
+            if not normalized:
+                continue
+            self._add(normalized)
+
+        self._build_fail_links()
+
+    def __len__(self):
+        return len(self._terms)
+
+    @property
+    def terms(self):
+        return frozenset(self._terms.values())
+
+    def _add(self, term: str):
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        if len(term) not in self._out[state]:
+            self._out[state] = self._out[state] + (len(term),)
+        self._terms[state] = term
+        self.max_length = max(self.max_length, len(term))
+
+    def _build_fail_links(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + tuple(
+                        length for length in out[fail[nxt]] if length not in out[nxt]
+                    )
+
+    def _scan(self, text: str, pos: int = 0):
+        """Yield (start, end, first, last) for every boundary-respecting hit.
+
+        `start`/`end` index the original text, `first`/`last` count characters
+        fed to the automaton. Hits come out ordered by end position.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        state = 0
+        # positions[k] = index asal bagi aksara ke-k yang masuk automaton,
+        # perlu sebab whitespace berturut-turut dilangkau.
+        positions = []
+        prev_space = False
+        for i in range(pos, n):
+            ch = text[i]
+            if ch.isspace():
+                if prev_space:
+                    continue
+                prev_space = True
+                ch = " "
+            else:
+                prev_space = False
+                ch = _fold(ch)
+            positions.append(i)
+
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            lengths = out[state]
+            if not lengths:
+                continue
+            if i + 1 < n and _is_word_char(text[i + 1]):
+                continue
+            last = len(positions)
+            for length in lengths:
+                begin = positions[-length]
+                if begin > 0 and _is_word_char(text[begin - 1]):
+                    continue
+                yield begin, i + 1, last - length, last
+
+    def _search(self, text: str, pos: int = 0):
+        best = None
+        for begin, end, first, last in self._scan(text, pos):
+            if best is not None and last - self.max_length > best[2]:
+                # Tiada padanan lain boleh bermula lebih awal atau sama dengan ini
+                break
+            if best is None or begin < best[0] or (begin == best[0] and end > best[1]):
+                best = (begin, end, first)
+        if best is None:
+            return None
+        return best[0], best[1]
+
+    def _iter_spans(self, text: str, pos: int = 0):
+        # Yield (start, end, term) padanan tak bertindih dalam teks asal
+        if self._normalizer is None:
+            while pos < len(text):
+                span = self._search(text, pos)
+                if span is None:
+                    return
+                begin, end = span
+                yield begin, end, _normalize_term(text[begin:end])
+                pos = end
+            return
+
+        normalized = self._normalizer(text)
+        scanned = normalized.text
+        # Tukar pos (index asal) ke index dalam teks yang dinormalisasi
+        npos = bisect_left(normalized.starts, pos) if pos else 0
+        while npos < len(scanned):
+            span = self._search(scanned, npos)
+            if span is None:
+                return
+            begin, end = span
+            orig_begin, orig_end = normalized.original_span(begin, end)
+            yield orig_begin, orig_end, _normalize_term(scanned[begin:end])
+            npos = end
+
+    def search(self, text: str, pos: int = 0):
+        """Return the leftmost (then longest) match in `text[pos:]`, or None."""
+        for begin, end, term in self._iter_spans(text, pos):
+            return ProfanityMatch(text, term, begin, end)
+        return None
+
+    def finditer(self, text: str):
+        """Yield non-overlapping matches from left to right."""
+        for begin, end, term in self._iter_spans(text):
+            yield ProfanityMatch(text, term, begin, end)
+
+    def findall(self, text: str):
+        return [match.group() for match in self.finditer(text)]
@@ -0,0 +1,128 @@
+# helpers/spam_detector.py
+#
+# Pengesan spam/flood per user per channel. Setiap mesej hanya buat kerja O(1):
+# ring buffer masa mesej, kaunter "leaky bucket" untuk mention dan link, dan
+# hash mesej terakhir untuk mesej berulang. User yang senyap terlalu lama
+# dibuang dari memori secara automatik.
+
+import re
+import time
+from collections import deque, OrderedDict
+
+LINK_RE = re.compile(r"https?://|discord\.gg/", re.IGNORECASE)
+
+
+def count_links(content: str) -> int:
+    return len(LINK_RE.findall(content))
+
+
+class _LeakyCounter:
+    # Kaunter yang bocor `rate` unit sesaat; naik bila ada mention/link
+    __slots__ = ("level", "updated")
+
+    def __init__(self):
+        self.level = 0.0
+        self.updated = 0.0
+
+    def add(self, amount: int, now: float, rate: float) -> float:
+        self.level = max(0.0, self.level - (now - self.updated) * rate) + amount
+        self.updated = now
+        return self.level
+
+
+class _UserState:
+    __slots__ = ("last_seen", "timestamps", "mentions", "links", "last_hash", "repeats")
+
+    def __init__(self, max_messages: int):
+        self.last_seen = 0.0
+        self.timestamps = deque(maxlen=max_messages)
+        self.mentions = _LeakyCounter()
+        self.links = _LeakyCounter()
+        self.last_hash = None
+        self.repeats = 0
+
+
+class SpamDetector:
+    """Sliding-window flood, mention, link and repeat detector.
+
+    `check()` returns a short reason ("spam", "mention spam", "link spam",
+    "repeated messages") when a threshold is crossed, else None. The
+    triggering counter is reset, so one burst gives one offense.
+    """
+
+    def __init__(
+        self,
+        max_messages: int = 6,
+        message_window: float = 5.0,
+        max_mentions: int = 8,
+        mention_window: float = 10.0,
+        max_links: int = 4,
+        link_window: float = 10.0,
+        max_repeats: int = 4,
+        idle_ttl: float = 120.0,
+        max_tracked: int = 50000,
+    ):
+        self.max_messages = max_messages
+        self.message_window = message_window
+        self.max_mentions = max_mentions
+        self.mention_rate = max_mentions / mention_window
+        self.max_links = max_links
+        self.link_rate = max_links / link_window
+        self.max_repeats = max_repeats
+        self.idle_ttl = idle_ttl
+        self.max_tracked = max_tracked
+        # (guild_id, channel_id, user_id) -> _UserState, paling lama di depan
+        self._states = OrderedDict()
+
+    def __len__(self):
+        return len(self._states)
+
+    def _expire(self, now: float):
+        states = self._states
+        cutoff = now - self.idle_ttl
+        while states:
+            key, state = next(iter(states.items()))
+            if state.last_seen >= cutoff and len(states) <= self.max_tracked:
+                break
+            del states[key]
+
+    def check(self, guild_id: int, channel_id: int, user_id: int, content: str,
+              mention_count: int = 0, link_count: int = 0, now: float = None):
+        now = time.monotonic() if now is None else now
+        key = (guild_id, channel_id, user_id)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _UserState(self.max_messages)
+        else:
+            self._states.move_to_end(key)
+        state.last_seen = now
+        self._expire(now)
+
+        timestamps = state.timestamps
+        timestamps.append(now)
+        if len(timestamps) == self.max_messages and now - timestamps[0] <= self.message_window:
+            timestamps.clear()
+            return "spam"
+
+        if mention_count and state.mentions.add(mention_count, now, self.mention_rate) > self.max_mentions:
+            state.mentions.level = 0.0
+            return "mention spam"
+
+        if link_count and state.links.add(link_count, now, self.link_rate) > self.max_links:
+            state.links.level = 0.0
+            return "link spam"
+
+        content = content.strip().lower()
+        if not content:
+            return None
+        content_hash = hash(content)
+        if content_hash == state.last_hash:
+            state.repeats += 1
+            if state.repeats >= self.max_repeats:
+                state.repeats = 0
+                state.last_hash = None
+                return "repeated messages"
+        else:
+            state.last_hash = content_hash
+            state.repeats = 1
+        return None
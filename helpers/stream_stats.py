@@ -0,0 +1,80 @@
+# helpers/stream_stats.py
+#
+# Ukur CPU proses ffmpeg bagi setiap stream muzik, diasingkan ikut mod
+# (passthrough opus, transcode, fail cache), supaya penjimatan passthrough
+# boleh dilihat. Perlu psutil; tanpa psutil statistik tidak dikumpul.
+
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MODES = ("passthrough", "transcode", "cache")
+
+
+class _Stream:
+    __slots__ = ("process", "mode", "title", "started", "cpu")
+
+    def __init__(self, process, mode, title):
+        self.process = process
+        self.mode = mode
+        self.title = title
+        self.started = time.monotonic()
+        self.cpu = 0.0
+
+
+class StreamStats:
+    """Per-stream ffmpeg CPU time, totalled per playback mode."""
+
+    def __init__(self):
+        self.enabled = psutil is not None
+        self._streams = {}
+        # mode -> [bilangan stream, saat CPU, saat main]
+        self.totals = {mode: [0, 0.0, 0.0] for mode in MODES}
+
+    def watch(self, guild_id, source, mode: str, title: str = ""):
+        """Start tracking the ffmpeg process behind `source` (an FFmpegAudio)."""
+        self.finish(guild_id)
+        process = getattr(source, "_process", None)
+        if not self.enabled or process is None:
+            return
+        try:
+            handle = psutil.Process(process.pid)
+        except psutil.Error:
+            return
+        self._streams[guild_id] = _Stream(handle, mode, title)
+
+    def _sample(self, stream):
+        try:
+            times = stream.process.cpu_times()
+            stream.cpu = times.user + times.system
+        except psutil.Error:
+            # Proses sudah tamat; guna bacaan terakhir
+            pass
+
+    def sample_all(self):
+        """Refresh CPU readings; call periodically so ended processes keep a recent value."""
+        for stream in self._streams.values():
+            self._sample(stream)
+
+    def finish(self, guild_id):
+        """Stop tracking the guild's stream and add it to the totals; returns (mode, cpu_s, wall_s) or None."""
+        stream = self._streams.pop(guild_id, None)
+        if stream is None:
+            return None
+        self._sample(stream)
+        wall = time.monotonic() - stream.started
+        total = self.totals[stream.mode]
+        total[0] += 1
+        total[1] += stream.cpu
+        total[2] += wall
+        if wall > 0:
+            print(f"Stream stats [{stream.mode}] {stream.title}: {stream.cpu:.2f}s CPU over {wall:.0f}s ({stream.cpu / wall:.2%})")
+        return stream.mode, stream.cpu, wall
+
+    def current(self):
+        """(guild_id, mode, cpu_s, wall_s) for every stream still playing."""
+        now = time.monotonic()
+        return [(guild_id, s.mode, s.cpu, now - s.started) for guild_id, s in self._streams.items()]
@@ -0,0 +1,235 @@
+# helpers/text_normalizer.py
+#
+# Normalisasi mesej sebelum masuk ProfanityMatcher, untuk tangkap cubaan
+# mengelak filter: leetspeak ("sh1t"), huruf berulang 3 kali atau lebih
+# ("fuuuck"; huruf berganda biasa seperti "hell" kekal), zero-width
+# character, diakritik ("bäbï"), huruf Cyrillic/Greek yang nampak sama, dan
+# huruf dijarakkan ("b a b i", "f-u-c-k").
+#
+# Semua jadual dikira sekali masa import. normalize() baca mesej sekali sahaja
+# dan simpan index asal bagi setiap aksara output, supaya padanan boleh dipeta
+# balik ke teks sebenar yang ditaip.
+
+import unicodedata
+
+# Aksara yang dibuang terus (zero-width, soft hyphen, BOM, dll.)
+_INVISIBLE = (
+    "\u00ad\u034f\u061c\u115f\u1160\u17b4\u17b5\u180e\u200b\u200c\u200d\u200e"
+    "\u200f\u2060\u2061\u2062\u2063\u2064\ufeff"
+)
+
+# Huruf yang nampak sama dengan huruf Latin
+_CONFUSABLES = {
+    # Cyrillic
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+    "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ї": "i", "ј": "j",
+    "ѕ": "s", "ԁ": "d", "ԛ": "q", "ԝ": "w", "ь": "b",
+    # Greek
+    "α": "a", "β": "b", "ε": "e", "η": "n", "ι": "i", "κ": "k", "ν": "v", "ο": "o",
+    "ρ": "p", "τ": "t", "υ": "u", "χ": "x", "ω": "w",
+    # Latin yang NFKD tak pecahkan
+    "ł": "l", "ø": "o", "đ": "d", "ħ": "h", "ı": "i", "ŧ": "t", "ß": "ss", "æ": "ae",
+    "œ": "oe", "þ": "th", "ƒ": "f",
+}
+
+# Leetspeak, hanya dipakai bila aksara berada di dalam perkataan
+_LEET = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "9": "g",
+    "@": "a", "$": "s", "!": "i", "|": "l", "+": "t", "€": "e", "£": "l",
+}
+
+# Julat codepoint yang diproses dengan NFKD: Latin-1/Extended, Greek/Cyrillic,
+# Latin Extended Additional, letterlike, circled, fullwidth, math alphanumeric
+_FOLD_RANGES = (
+    (0x00C0, 0x0250),
+    (0x0370, 0x0530),
+    (0x1E00, 0x1F00),
+    (0x2100, 0x2150),
+    (0x2460, 0x2500),
+    (0xFF00, 0xFF70),
+    (0x1D400, 0x1D800),
+)
+
+# Julat combining mark yang dibuang ("s̶h̶i̶t̶", zalgo text)
+_COMBINING_RANGES = (
+    (0x0300, 0x0370),
+    (0x0483, 0x048A),
+    (0x1AB0, 0x1B00),
+    (0x1DC0, 0x1E00),
+    (0x20D0, 0x2100),
+    (0xFE20, 0xFE30),
+)
+
+
+def _build_fold_table():
+    table = {}
+    for start, end in _FOLD_RANGES:
+        for cp in range(start, end):
+            ch = chr(cp)
+            decomposed = unicodedata.normalize("NFKD", ch)
+            base = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+            if base and base != ch and base.isascii() and base.isalnum():
+                table[ch] = base
+    for ch, base in _CONFUSABLES.items():
+        table[ch] = base
+        table[ch.upper()] = base
+    # Regional indicator 🇦-🇿 selalu dipakai untuk eja perkataan
+    for offset in range(26):
+        table[chr(0x1F1E6 + offset)] = chr(ord("a") + offset)
+    for ch in _INVISIBLE:
+        table[ch] = ""
+    for start, end in _COMBINING_RANGES:
+        for cp in range(start, end):
+            table[chr(cp)] = ""
+    return table
+
+
+_FOLD = _build_fold_table()
+
+
+def _fold(ch: str) -> str:
+    folded = _FOLD.get(ch)
+    if folded is not None:
+        return folded
+    lowered = ch.lower()
+    return lowered if len(lowered) == 1 else ch
+
+
+def _is_letter(ch: str) -> bool:
+    return ch.isalpha()
+
+
+def _is_word(ch: str) -> bool:
+    # Underscore dikira separator di sini ("f_u_c_k")
+    return ch.isalnum()
+
+
+def _leet_in_word(text: str, i: int, out: list, pending_sep: int) -> bool:
+    # Leetspeak hanya dipakai di dalam perkataan ("sh1t", "@ss", "sh!t"),
+    # supaya nombor biasa ("room 101") dan tanda seru ("hell!") tak berubah.
+    if i + 1 < len(text) and _is_letter(_fold(text[i + 1])[:1]):
+        return True
+    return text[i].isdigit() and pending_sep < 0 and bool(out) and _is_letter(out[-1])
+
+
+class NormalizedText:
+    """Normalized message plus the original span of every output character."""
+
+    __slots__ = ("original", "text", "starts", "ends")
+
+    def __init__(self, original: str, text: str, starts: list, ends: list):
+        self.original = original
+        self.text = text
+        # starts[k]/ends[k] = julat dalam mesej asal bagi aksara output ke-k
+        self.starts = starts
+        self.ends = ends
+
+    def original_span(self, start: int, end: int) -> tuple:
+        """Map a `[start, end)` span of `text` back onto `original`."""
+        return self.starts[start], self.ends[end - 1]
+
+    def __repr__(self):
+        return f"<NormalizedText {self.text!r}>"
+
+
+def _next_token_is_single(text: str, i: int, folded: str) -> bool:
+    # Lihat ke depan: adakah token yang bermula di text[i] hanya satu huruf?
+    # Huruf berulang 3 kali atau lebih ("b aaa b") dan aksara halimunan
+    # dikira sebagai satu; "aa" kekal dua huruf, sama seperti normalize().
+    n = len(text)
+    j = i + 1
+    run = 1
+    while j < n:
+        nxt = _fold(text[j])
+        if nxt == "":
+            j += 1
+            continue
+        if nxt == folded:
+            run += 1
+            j += 1
+            continue
+        if _is_word(nxt[0]):
+            return False
+        if text[j] in _LEET and j + 1 < n and _is_letter(_fold(text[j + 1])[:1]):
+            return False
+        break
+    return run != 2
+
+
+def normalize(text: str) -> NormalizedText:
+    """Fold `text` into the form the profanity matcher scans.
+
+    In one pass: drop invisible and combining characters, fold diacritics,
+    confusables and case, decode leetspeak inside words, collapse runs of
+    three or more identical letters (double letters are kept), turn
+    separator runs into one space and glue spaced-out single letters
+    ("b a b i" -> "babi") back into a word.
+    """
+    out = []
+    starts = []
+    ends = []
+    n = len(text)
+
+    token_len = 0        # bilangan aksara token asal semasa (sebelum glue)
+    run = 0              # berapa kali huruf terakhir dalam output berulang
+    prev_token_len = 0   # panjang token sebelum separator yang belum di-emit
+    pending_sep = -1     # index asal separator yang belum di-emit, -1 jika tiada
+
+    fold_get = _FOLD.get
+    leet_get = _LEET.get
+    for i in range(n):
+        ch = text[i]
+        folded = fold_get(ch)
+        if folded is None:
+            folded = ch.lower()
+            if len(folded) != 1:
+                folded = ch
+        elif folded == "":
+            continue
+
+        leet = leet_get(ch)
+        if leet is not None and _leet_in_word(text, i, out, pending_sep):
+            folded = leet
+        elif not _is_word(folded[0]):
+            # Separator: whitespace, tanda baca, emoji, dll.
+            if pending_sep < 0 and out:
+                pending_sep = i
+                prev_token_len = token_len
+                token_len = 0
+            continue
+
+        if pending_sep >= 0:
+            glue = (
+                prev_token_len == 1
+                and _is_letter(folded[0])
+                and _next_token_is_single(text, i, folded)
+            )
+            if not glue:
+                out.append(" ")
+                starts.append(pending_sep)
+                ends.append(pending_sep + 1)
+            pending_sep = -1
+
+        if out and out[-1] == folded and folded.isalpha():
+            run += 1
+            if run == 3:
+                # Huruf ketiga: ini ulangan sengaja, buang huruf kedua
+                out.pop()
+                starts.pop()
+                ends.pop()
+                token_len -= 1
+            if run >= 3:
+                # Panjangkan julat asal, jangan tambah output
+                ends[-1] = i + 1
+                continue
+        else:
+            run = 1
+
+        token_len += 1
+        for part in folded:
+            out.append(part)
+            starts.append(i)
+            ends.append(i + 1)
+
+    return NormalizedText(text, "".join(out), starts, ends)
+
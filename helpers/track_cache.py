@@ -0,0 +1,253 @@
+# helpers/track_cache.py
+#
+# Cache hasil carian yt-dlp untuk /play. Query yang sama (selepas dinormalkan)
+# terus dapat metadata lagu tanpa extraction baru: LRU dalam memori dahulu,
+# kemudian SQLite. Stream URL YouTube tamat tempoh dalam beberapa jam, jadi
+# ia disimpan berasingan bersama masa tamat dan hanya diperbaharui bila lagu
+# betul-betul hendak dimainkan.
+
+import os
+import re
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+from helpers.db_helpers import SQLiteWorker
+
+DATA_FOLDER = "data"
+TRACK_CACHE_DB_PATH = os.path.join(DATA_FOLDER, "music_cache.db")
+
+# Jika URL tiada parameter expire, anggap hidup selama ini (saat)
+DEFAULT_STREAM_TTL = 4 * 3600
+
+CREATE_TRACK_CACHE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS tracks (
+        video_id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        duration INTEGER NOT NULL,
+        thumbnail TEXT,
+        webpage_url TEXT,
+        format_id TEXT,
+        ext TEXT,
+        acodec TEXT,
+        abr REAL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS queries (
+        query TEXT PRIMARY KEY,
+        video_id TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS stream_urls (
+        video_id TEXT PRIMARY KEY,
+        url TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        acodec TEXT
+    )
+    """,
+]
+
+UPSERT_TRACK_SQL = """
+    INSERT INTO tracks (video_id, title, duration, thumbnail, webpage_url, format_id, ext, acodec, abr, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(video_id) DO UPDATE SET
+        title = excluded.title, duration = excluded.duration, thumbnail = excluded.thumbnail,
+        webpage_url = excluded.webpage_url, format_id = excluded.format_id, ext = excluded.ext,
+        acodec = excluded.acodec, abr = excluded.abr, updated_at = excluded.updated_at;
+"""
+
+UPSERT_QUERY_SQL = """
+    INSERT INTO queries (query, video_id, created_at) VALUES (?, ?, ?)
+    ON CONFLICT(query) DO UPDATE SET video_id = excluded.video_id, created_at = excluded.created_at;
+"""
+
+UPSERT_STREAM_SQL = """
+    INSERT INTO stream_urls (video_id, url, expires_at, acodec) VALUES (?, ?, ?, ?)
+    ON CONFLICT(video_id) DO UPDATE SET url = excluded.url, expires_at = excluded.expires_at, acodec = excluded.acodec;
+"""
+
+SELECT_BY_QUERY_SQL = """
+    SELECT t.video_id, t.title, t.duration, t.thumbnail, t.webpage_url, t.format_id, t.ext, t.acodec, t.abr
+    FROM queries q JOIN tracks t ON t.video_id = q.video_id
+    WHERE q.query = ? AND q.created_at >= ?;
+"""
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive cache key for a search query."""
+    return _WHITESPACE_RE.sub(" ", query).strip().casefold()
+
+
+def stream_expiry(url: str, now: float = None) -> float:
+    """Expiry time of a stream URL, read from its `expire` parameter when present."""
+    now = time.time() if now is None else now
+    try:
+        expire = parse_qs(urlparse(url).query).get("expire")
+        if expire:
+            return float(expire[0])
+    except ValueError:
+        pass
+    return now + DEFAULT_STREAM_TTL
+
+
+class TrackInfo:
+    __slots__ = ("video_id", "title", "duration", "thumbnail", "webpage_url", "format_id", "ext", "acodec", "abr")
+
+    def __init__(self, video_id, title, duration, thumbnail=None, webpage_url=None, format_id=None,
+                 ext=None, acodec=None, abr=None):
+        self.video_id = video_id
+        self.title = title
+        self.duration = duration
+        self.thumbnail = thumbnail
+        self.webpage_url = webpage_url
+        self.format_id = format_id
+        self.ext = ext
+        self.acodec = acodec
+        self.abr = abr
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Build from a resolved yt-dlp info dict."""
+        video_id = entry.get("id")
+        return cls(
+            video_id,
+            entry.get("title") or "Untitled",
+            int(entry.get("duration") or 0),
+            entry.get("thumbnail"),
+            entry.get("webpage_url") or (f"https://www.youtube.com/watch?v={video_id}" if video_id else None),
+            entry.get("format_id"),
+            entry.get("ext"),
+            entry.get("acodec"),
+            entry.get("abr"),
+        )
+
+    def as_row(self, now):
+        return (self.video_id, self.title, self.duration, self.thumbnail, self.webpage_url,
+                self.format_id, self.ext, self.acodec, self.abr, now)
+
+
+class TrackCache:
+    """Query -> track metadata cache (memory LRU over SQLite), plus stream URLs with expiry."""
+
+    def __init__(self, path: str = TRACK_CACHE_DB_PATH, max_entries: int = 2000, query_ttl_days: float = 30):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self.max_entries = max_entries
+        self.query_ttl = query_ttl_days * 86400
+        self.hits = 0
+        self.misses = 0
+        # normalized query -> (TrackInfo, created_at)
+        self._queries = OrderedDict()
+        # video_id -> (url, expires_at, acodec), susunan LRU seperti _queries
+        self._streams = OrderedDict()
+        self._worker = SQLiteWorker(path, name="track-cache")
+        self._worker.run_sync(self._create_tables)
+
+    @staticmethod
+    def _create_tables(connection):
+        with connection:
+            for statement in CREATE_TRACK_CACHE_SQL:
+                connection.execute(statement)
+            # Fail cache lama: stream_urls belum ada lajur acodec
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(stream_urls);")]
+            if "acodec" not in columns:
+                connection.execute("ALTER TABLE stream_urls ADD COLUMN acodec TEXT;")
+
+    def _remember(self, key, track, created_at):
+        self._queries[key] = (track, created_at)
+        self._queries.move_to_end(key)
+        while len(self._queries) > self.max_entries:
+            self._queries.popitem(last=False)
+
+    def _remember_stream(self, video_id, value):
+        self._streams[video_id] = value
+        self._streams.move_to_end(video_id)
+        while len(self._streams) > self.max_entries:
+            self._streams.popitem(last=False)
+
+    async def lookup(self, query: str):
+        """Cached TrackInfo for a search query, or None."""
+        key = normalize_query(query)
+        now = time.time()
+        cached = self._queries.get(key)
+        if cached is not None and cached[1] >= now - self.query_ttl:
+            self._queries.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+
+        row = await self._worker.run(
+            lambda connection: connection.execute(SELECT_BY_QUERY_SQL, (key, now - self.query_ttl)).fetchone()
+        )
+        if row is None:
+            self.misses += 1
+            return None
+        track = TrackInfo(*row)
+        self._remember(key, track, now)
+        self.hits += 1
+        return track
+
+    async def store(self, query: str, entry) -> TrackInfo:
+        """Save a resolved yt-dlp entry under `query`; its stream URL is kept too."""
+        track = TrackInfo.from_entry(entry)
+        if not track.video_id:
+            return track
+        key = normalize_query(query) if query else None
+        now = time.time()
+        url = entry.get("url")
+        acodec = entry.get("acodec")
+        expires_at = stream_expiry(url, now) if url else None
+        if url:
+            self._remember_stream(track.video_id, (url, expires_at, acodec))
+        if key:
+            self._remember(key, track, now)
+
+        def job(connection):
+            with connection:
+                connection.execute(UPSERT_TRACK_SQL, track.as_row(now))
+                if key:
+                    connection.execute(UPSERT_QUERY_SQL, (key, track.video_id, now))
+                if url:
+                    connection.execute(UPSERT_STREAM_SQL, (track.video_id, url, expires_at, acodec))
+        try:
+            await self._worker.run(job)
+        except Exception as e:
+            print(f"Failed to save track cache entry for {track.video_id}: {e}")
+        return track
+
+    async def stream_url(self, video_id: str, min_ttl: float = 0):
+        """Stored stream URL still valid for at least `min_ttl` seconds, or None."""
+        cached = self._streams.get(video_id)
+        if cached is None:
+            row = await self._worker.run(
+                lambda connection: connection.execute(
+                    "SELECT url, expires_at, acodec FROM stream_urls WHERE video_id = ?;", (video_id,)
+                ).fetchone()
+            )
+            if row is None:
+                return None
+            cached = tuple(row)
+            self._remember_stream(video_id, cached)
+        else:
+            self._streams.move_to_end(video_id)
+        url, expires_at, _ = cached
+        if expires_at - time.time() < min_ttl:
+            return None
+        return url
+
+    def stream_codec(self, video_id: str, url: str):
+        """Audio codec of a stream URL returned by `stream_url`/`store`, or None if unknown."""
+        cached = self._streams.get(video_id)
+        if cached is None or cached[0] != url:
+            return None
+        return cached[2]
+
+    async def close(self):
+        await self._worker.close()
@@ -0,0 +1,105 @@
+# helpers/webhook_sink.py
+#
+# Hantar action log melalui webhook channel, bukan channel.send bot.
+# Webhook ada rate limit sendiri, jadi log yang banyak tak lambatkan mesej
+# moderation atau muzik. Semua webhook guna satu aiohttp session, dan jika
+# webhook gagal, log dihantar terus melalui channel.send seperti biasa.
+
+import time
+import aiohttp
+import discord
+
+WEBHOOK_NAME = "ALPHA™ Action Log"
+
+
+class _WebhookPool:
+    __slots__ = ("webhooks", "down_until", "next_index", "retry_at")
+
+    def __init__(self):
+        self.webhooks = []
+        self.down_until = []
+        self.next_index = 0
+        # Bila boleh cuba cari/buat webhook semula (0 = sekarang)
+        self.retry_at = 0.0
+
+
+class WebhookSink:
+    """Pooled webhook sender with a fallback to `channel.send`.
+
+    Up to `pool_size` webhooks named `WEBHOOK_NAME` are found or created per
+    log channel and used round-robin. A webhook that fails with an auth,
+    server or network error is skipped for `cooldown` seconds; when none is
+    usable the batch goes through the channel instead. Other 4xx errors
+    (a rejected payload) are raised to the caller.
+    """
+
+    def __init__(self, pool_size: int = 2, cooldown: float = 60.0):
+        self.pool_size = pool_size
+        self.cooldown = cooldown
+        self._session = None
+        self._pools = {}
+
+    async def start(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _load_pool(self, channel, pool):
+        try:
+            existing = [wh for wh in await channel.webhooks() if wh.name == WEBHOOK_NAME and wh.token]
+            while len(existing) < self.pool_size:
+                existing.append(await channel.create_webhook(name=WEBHOOK_NAME, reason="Action log sink"))
+        except (discord.Forbidden, discord.HTTPException) as e:
+            print(f"Action log webhooks unavailable in #{channel}: {e}")
+            pool.retry_at = time.monotonic() + self.cooldown
+            return
+        # Guna semula session sendiri, bukan HTTP client bot
+        pool.webhooks = [discord.Webhook.from_url(wh.url, session=self._session) for wh in existing[:self.pool_size]]
+        pool.down_until = [0.0] * len(pool.webhooks)
+        pool.retry_at = 0.0
+
+    def _pick(self, pool):
+        now = time.monotonic()
+        count = len(pool.webhooks)
+        for offset in range(count):
+            index = (pool.next_index + offset) % count
+            if pool.down_until[index] <= now:
+                pool.next_index = index + 1
+                return index
+        return None
+
+    async def send(self, channel, embeds):
+        if self._session is None:
+            await channel.send(embeds=embeds)
+            return
+
+        pool = self._pools.get(channel.id)
+        if pool is None:
+            pool = self._pools[channel.id] = _WebhookPool()
+        if not pool.webhooks and pool.retry_at <= time.monotonic():
+            await self._load_pool(channel, pool)
+
+        index = self._pick(pool) if pool.webhooks else None
+        if index is not None:
+            try:
+                await pool.webhooks[index].send(embeds=embeds, username=WEBHOOK_NAME)
+                return
+            except discord.NotFound:
+                # Webhook dipadam dari channel, cari semula lain kali
+                pool.webhooks = []
+            except discord.HTTPException as e:
+                # 400 dan 4xx lain = embed tak sah, bukan webhook rosak; biar
+                # dispatcher cuba hantar embed satu-satu
+                if e.status not in (401, 403) and e.status < 500:
+                    raise
+                print(f"Action log webhook failed in #{channel}, falling back: {e}")
+                pool.down_until[index] = time.monotonic() + self.cooldown
+            except aiohttp.ClientError as e:
+                print(f"Action log webhook failed in #{channel}, falling back: {e}")
+                pool.down_until[index] = time.monotonic() + self.cooldown
+
+        await channel.send(embeds=embeds)